@@ -1,3 +1,7 @@
+from array import array
+from bisect import bisect_right
+from sys import intern
+
 import ply.lex as lex
 
 try:
@@ -24,6 +28,7 @@ class MyLexer:
 
         self.filename = None            # Nome do arquivo sendo processado
         self.input_text = None          # Armazena o texto de entrada para referência futura
+        self.line_starts = array('i', [0])  # Posição de início de cada linha do texto de entrada (ordenada)
 
     def build(self, **kwargs):
         """Constrói o analisador léxico."""
@@ -43,8 +48,19 @@ class MyLexer:
         self.reset()                    # Automaticamente reseta ao receber nova entrada
         self.filename = filename        # Nome do arquivo sendo processado
         self.input_text = data          # Armazena o texto de entrada
+        self.line_starts = self._compute_line_starts(data)
         self.lexer.input(data)          # Fornece os dados ao lexer PLY
 
+    @staticmethod
+    def _compute_line_starts(data):
+        """Retorna a posição inicial de cada linha de data (uma passada com str.find, inteiros compactos)."""
+        line_starts = array('i', [0])
+        pos = data.find('\n')
+        while pos != -1:
+            line_starts.append(pos + 1)
+            pos = data.find('\n', pos + 1)
+        return line_starts
+
     def token(self):
         """Retorna o próximo token do fluxo de entrada."""
         tok = self.lexer.token()
@@ -76,10 +92,17 @@ class MyLexer:
             raise StopIteration
         return tok
 
+    def find_line_bounds(self, pos):
+        """Retorna (início, fim) da linha que contém pos; o fim exclui o '\n' (busca binária em line_starts)."""
+        line = bisect_right(self.line_starts, pos)      # Índice da próxima linha
+        if line < len(self.line_starts):
+            return self.line_starts[line - 1], self.line_starts[line] - 1
+        return self.line_starts[line - 1], len(self.input_text)
+
     def find_column(self, token):
         """Retorna a coluna do token na linha."""
         pos = token.lexpos if hasattr(token, 'lexpos') else token
-        line_start = self.input_text.rfind('\n', 0, pos) + 1
+        line_start = self.line_starts[bisect_right(self.line_starts, pos) - 1]
         return (pos - line_start) + 1
 
     def get_errors(self):
@@ -89,11 +112,7 @@ class MyLexer:
     def get_error_context(self, token_or_pos):
         """Retorna o contexto do erro para um token específico."""
         pos = token_or_pos.lexpos if hasattr(token_or_pos, 'lexpos') else token_or_pos
-        line_start = self.input_text.rfind('\n', 0, pos) + 1
-        line_end = self.input_text.find('\n', pos)
-
-        if line_end == -1:
-            line_end = len(self.input_text)
+        line_start, line_end = self.find_line_bounds(pos)
         return self.input_text[line_start:line_end]
 
     def format_error_pointer(self, token_or_pos):
@@ -130,6 +149,9 @@ class MyLexer:
     '''
     def t_NEW_DATATYPE(self, t):
         r"[a-zA-Z][a-zA-Z]*DataType"
+        # Nomes e palavras reservadas se repetem pelo arquivo todo: internados, cada um vira um único objeto
+        # compartilhado pelos tokens, nós da AST e tabelas do semântico (comparações por identidade primeiro)
+        t.value = intern(t.value)
         t.type = reserved.get(t.value, "NEW_DATATYPE")
         t.category = get_token_category(t.type)
         return t
@@ -165,6 +187,7 @@ class MyLexer:
     '''
     def t_INSTANCE_NAME(self, t):
         r"[a-z][a-zA-Z_]*[0-9]+"
+        t.value = intern(t.value)  # Ver t_NEW_DATATYPE
         t.type = "INSTANCE_NAME"  # Nomes de instâncias nunca são palavras reservadas (terminam com números)
         t.category = get_token_category("INSTANCE_NAME")
         return t
@@ -176,6 +199,7 @@ class MyLexer:
     '''
     def t_CLASS_NAME(self, t):
         r"[A-Z][a-zA-Z0-9_]*"
+        t.value = intern(t.value)  # Ver t_NEW_DATATYPE
         t.type = reserved.get(t.value, "CLASS_NAME")
         t.category = get_token_category(t.type)
         return t
@@ -187,12 +211,14 @@ class MyLexer:
     '''
     def t_RELATION_NAME(self, t):
         r"[a-z][a-zA-Z_]*"
+        t.value = intern(t.value)  # Ver t_NEW_DATATYPE
         t.type = reserved.get(t.value, "RELATION_NAME")
         t.category = get_token_category(t.type)
         return t
 
     def t_IDENTIFIER(self, t):
         r"[a-zA-Z_][a-zA-Z0-9_]*"
+        t.value = intern(t.value)  # Ver t_NEW_DATATYPE
         t.type = reserved.get(t.value, "IDENTIFIER")
         t.category = get_token_category(t.type)
         return t
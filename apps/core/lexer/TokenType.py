@@ -17,7 +17,7 @@ Examples:
     Obter categoria de um token:
 
     >>> from TokenType import get_token_category
-    >>> category = get_token_category('CLASS_KIND')
+    >>> category = get_token_category('CLASS_STEREOTYPE')
     >>> print(category)
     'CLASS_STEREOTYPE'
 """
@@ -37,7 +37,6 @@ language_keywords = {
     "import": "KEYWORD_IMPORT",
     "functional-complexes": "KEYWORD_FUNCTIONAL_COMPLEXES",
     "specializes": "KEYWORD_SPECIALIZES",
-    "relator": "KEYWORD_RELATOR",
     "relators": "KEYWORD_RELATORS",
     "relation": "KEYWORD_RELATION",
     "inverseOf": "KEYWORD_INVERSEOF",
@@ -55,55 +54,59 @@ language_keywords = {
 }
 
 # OntoUML - Estereótipos de classe
+# Todos produzem o mesmo token CLASS_STEREOTYPE (o valor do token carrega o estereótipo),
+# então a gramática trata estereótipos de classe com um único terminal
 class_stereotypes = {
-    "event": "CLASS_EVENT",
-    "situation": "CLASS_SITUATION",
-    "process": "CLASS_PROCESS",
-    "category": "CLASS_CATEGORY",
-    "mixin": "CLASS_MIXIN",
-    "phaseMixin": "CLASS_PHASEMIXIN",
-    "roleMixin": "CLASS_ROLEMIXIN",
-    "historicalRoleMixin": "CLASS_HISTORICALROLEMIXIN",
-    "kind": "CLASS_KIND",
-    "collective": "CLASS_COLLECTIVE",
-    "quantity": "CLASS_QUANTITY",
-    "quality": "CLASS_QUALITY",
-    "mode": "CLASS_MODE",
-    "intrisicMode": "CLASS_INTRISICMODE",
-    "extrinsicMode": "CLASS_EXTRINSICMODE",
-    "subkind": "CLASS_SUBKIND",
-    "phase": "CLASS_PHASE",
-    "role": "CLASS_ROLE",
-    "historicalRole": "CLASS_HISTORICALROLE",
+    "event": "CLASS_STEREOTYPE",
+    "situation": "CLASS_STEREOTYPE",
+    "process": "CLASS_STEREOTYPE",
+    "category": "CLASS_STEREOTYPE",
+    "mixin": "CLASS_STEREOTYPE",
+    "phaseMixin": "CLASS_STEREOTYPE",
+    "roleMixin": "CLASS_STEREOTYPE",
+    "historicalRoleMixin": "CLASS_STEREOTYPE",
+    "kind": "CLASS_STEREOTYPE",
+    "collective": "CLASS_STEREOTYPE",
+    "quantity": "CLASS_STEREOTYPE",
+    "quality": "CLASS_STEREOTYPE",
+    "mode": "CLASS_STEREOTYPE",
+    "intrisicMode": "CLASS_STEREOTYPE",
+    "extrinsicMode": "CLASS_STEREOTYPE",
+    "subkind": "CLASS_STEREOTYPE",
+    "phase": "CLASS_STEREOTYPE",
+    "role": "CLASS_STEREOTYPE",
+    "historicalRole": "CLASS_STEREOTYPE",
+    "relator": "CLASS_STEREOTYPE",
 }
 
 # OntoUML - Estereótipos de relação
+# Mesmo esquema dos estereótipos de classe: um único token RELATION_STEREOTYPE com o estereótipo no valor
 relation_stereotypes = {
-    "material": "RELATION_MATERIAL",
-    "derivation": "RELATION_DERIVATION",
-    "comparative": "RELATION_COMPARATIVE",
-    "mediation": "RELATION_MEDIATION",
-    "characterization": "RELATION_CHARACTERIZATION",
-    "externalDependence": "RELATION_EXTERNALDEPENDENCE",
-    "componentOf": "RELATION_COMPONENTOF",
-    "memberOf": "RELATION_MEMBEROF",
-    "subCollectionOf": "RELATION_SUBCOLLECTIONOF",
-    "subQualityOf": "RELATION_SUBQUALITYOF",
-    "instantiation": "RELATION_INSTANTIATION",
-    "termination": "RELATION_TERMINATION",
-    "participational": "RELATION_PARTICIPATIONAL",
-    "participation": "RELATION_PARTICIPATION",
-    "historicalDependence": "RELATION_HISTORICALDEPENDENCE",
-    "creation": "RELATION_CREATION",
-    "manifestation": "RELATION_MANIFESTATION",
-    "bringsAbout": "RELATION_BRINGSABOUT",
-    "triggers": "RELATION_TRIGGERS",
-    "composition": "RELATION_COMPOSITION",
-    "aggregation": "RELATION_AGGREGATION",
-    "inherence": "RELATION_INHERENCE",
-    "value": "RELATION_VALUE",
-    "formal": "RELATION_FORMAL",
-    "constitution": "RELATION_CONSTITUTION",
+    "material": "RELATION_STEREOTYPE",
+    "derivation": "RELATION_STEREOTYPE",
+    "comparative": "RELATION_STEREOTYPE",
+    "mediation": "RELATION_STEREOTYPE",
+    "characterization": "RELATION_STEREOTYPE",
+    "externalDependence": "RELATION_STEREOTYPE",
+    "componentOf": "RELATION_STEREOTYPE",
+    "memberOf": "RELATION_STEREOTYPE",
+    "subCollectionOf": "RELATION_STEREOTYPE",
+    "subQualityOf": "RELATION_STEREOTYPE",
+    "instantiation": "RELATION_STEREOTYPE",
+    "termination": "RELATION_STEREOTYPE",
+    "participational": "RELATION_STEREOTYPE",
+    "participation": "RELATION_STEREOTYPE",
+    "historicalDependence": "RELATION_STEREOTYPE",
+    "creation": "RELATION_STEREOTYPE",
+    "manifestation": "RELATION_STEREOTYPE",
+    "bringsAbout": "RELATION_STEREOTYPE",
+    "triggers": "RELATION_STEREOTYPE",
+    "composition": "RELATION_STEREOTYPE",
+    "aggregation": "RELATION_STEREOTYPE",
+    "inherence": "RELATION_STEREOTYPE",
+    "value": "RELATION_STEREOTYPE",
+    "formal": "RELATION_STEREOTYPE",
+    "constitution": "RELATION_STEREOTYPE",
 }
 
 data_types = {
@@ -184,7 +187,7 @@ tokens = [
     "RELATION_NAME",
     "INSTANCE_NAME",
     "NEW_DATATYPE",
-] + list(set(reserved.values()))
+] + list(dict.fromkeys(reserved.values()))  # Sem duplicatas e em ordem fixa (um set mudaria a ordem a cada processo)
 
 
 def get_keyword_categories():
@@ -230,7 +233,7 @@ def get_token_category(token_type):
 
     Args:
         token_type (str): Tipo do token a ser categorizado. Exemplos:
-            'KEYWORD_PACKAGE', 'CLASS_KIND', 'RELATION_MATERIAL', 'IDENTIFIER'.
+            'KEYWORD_PACKAGE', 'CLASS_STEREOTYPE', 'RELATION_STEREOTYPE', 'IDENTIFIER'.
 
     Returns:
         str: Nome da categoria semântica. Possíveis valores:
@@ -250,7 +253,7 @@ def get_token_category(token_type):
     Examples:
         >>> get_token_category('KEYWORD_PACKAGE')
         'LANGUAGE_KEYWORD'
-        >>> get_token_category('CLASS_KIND')
+        >>> get_token_category('CLASS_STEREOTYPE')
         'CLASS_STEREOTYPE'
         >>> get_token_category('IDENTIFIER')
         'ID'
@@ -310,6 +313,10 @@ def _is_similar(s1: str, s2: str, threshold: int = 2) -> bool:
                 deletions = current_row[j] + 1
                 substitutions = previous_row[j] + (c1 != c2)
                 current_row.append(min(insertions, deletions, substitutions))
+            # Os valores da matriz nunca diminuem de uma linha para a seguinte:
+            # se toda a linha já passou do limiar, a distância final também passa
+            if min(current_row) > threshold:
+                return False
             previous_row = current_row
         
         return previous_row[-1] <= threshold
\ No newline at end of file
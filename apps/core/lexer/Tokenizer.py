@@ -35,12 +35,12 @@ import sys
 try:
     from .MyLexer import MyLexer
     from .TokenType import get_token_category
-    from .Utils import Colors, build_and_print_summary
+    from .Utils import Colors, build_and_print_summary, truncate_text
 except ImportError:
     # Fallback for when run as a script directly
     from MyLexer import MyLexer
     from TokenType import get_token_category
-    from Utils import Colors, build_and_print_summary
+    from Utils import Colors, build_and_print_summary, truncate_text
 
 
 def tokenize_file(filepath, truncate=False):
@@ -99,9 +99,7 @@ def tokenize_file(filepath, truncate=False):
         category = get_token_category(tok.type)
 
         # Truncate long values for display
-        display_value = str(tok.value)
-        if len(display_value) > 18:
-            display_value = display_value[:15] + "..."
+        display_value = truncate_text(str(tok.value), 18)
 
         # Build token line
         token_line = f"{tok.type:<25} {display_value:<20} {category:<20} {tok.lineno:<5} {tok.lexpos}"
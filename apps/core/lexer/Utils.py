@@ -20,6 +20,7 @@ Examples:
     ███████████████████░░░░░  75.0% (3/4)
 """
 
+import re
 import sys
 
 
@@ -309,6 +310,13 @@ BOX_STYLES = {
 }
 
 
+# Separador das colunas da tabela de tokens (TOKEN TYPE, VALUE, CATEGORY, LINE, COLUMN)
+_TOKEN_TABLE_SEPARATOR = f"  {'-' * 25} {'-' * 20} {'-' * 20} {'-' * 4} {'-' * 7}"
+
+# Expressão dos códigos de escape ANSI (compilada uma única vez)
+_ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+
 def strip_ansi_codes(text):
     """
     Remove códigos de escape ANSI de uma string.
@@ -329,10 +337,31 @@ def strip_ansi_codes(text):
         >>> strip_ansi_codes("Texto normal")
         'Texto normal'
     """
-    import re
+    return _ANSI_ESCAPE.sub("", text)
+
 
-    ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-    return ansi_escape.sub("", text)
+def truncate_text(text, max_len=60):
+    """
+    Trunca texto adicionando '...' se exceder o tamanho máximo.
+    
+    Textos que já cabem no limite são retornados sem cópia.
+    
+    Args:
+        text (str): Texto a truncar.
+        max_len (int): Tamanho máximo permitido (incluindo o '...').
+    
+    Returns:
+        str: Texto truncado ou original se menor que max_len.
+    
+    Examples:
+        >>> truncate_text("PascalCaseIdentifierName", 18)
+        'PascalCaseIdent...'
+        >>> truncate_text("curto", 18)
+        'curto'
+    """
+    if len(text) <= max_len:
+        return text
+    return text[:max_len - 3] + "..."
 
 
 def build_and_print_summary(
@@ -387,8 +416,7 @@ def build_and_print_summary(
 
         header_line = f"  {'TOKEN TYPE':<25} {'VALUE':<20} {'CATEGORY':<20} {'LINE':<5} {'COLUMN'}"
         content_lines.append(f"{Colors.BOLD}{header_line}{Colors.RESET}")
-        separator_line = f"  {'-' * 25} {'-' * 20} {'-' * 20} {'-' * 4} {'-' * 7}"
-        content_lines.append(separator_line)
+        content_lines.append(_TOKEN_TABLE_SEPARATOR)
 
         lines_to_show = token_lines
         truncated = False
@@ -439,7 +467,8 @@ def build_and_print_summary(
     # === BOX RENDER ===
     title = format_summary_header()
     title_length = len(strip_ansi_codes(title))
-    max_content_length = max(len(strip_ansi_codes(line)) for line in content_lines)
+    line_lengths = [len(strip_ansi_codes(line)) for line in content_lines]
+    max_content_length = max(line_lengths)
     content_width = max(title_length, max_content_length) + 4
 
     top_line = box["tl"] + box["h"] * content_width + box["tr"]
@@ -452,8 +481,7 @@ def build_and_print_summary(
     print(title_line)
     print(separator)
 
-    for line in content_lines:
-        line_length = len(strip_ansi_codes(line))
+    for line, line_length in zip(content_lines, line_lengths):
         spaces_needed = content_width - line_length - 4
         padded_line = box["v"] + "  " + line + " " * spaces_needed + "  " + box["v"]
         print(padded_line)
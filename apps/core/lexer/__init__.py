@@ -19,7 +19,7 @@ Examples:
     >>> lexer.input("kind Person")
     >>> token = lexer.token()
     >>> print(f"{token.type}: {token.value}")
-    CLASS_KIND: kind
+    CLASS_STEREOTYPE: kind
     
     Tokenização de arquivo via linha de comando:
     
@@ -6,84 +6,171 @@ Executa o pipeline completo: Lexer -> Parser -> Análise Semântica
 e exibe os resultados usando o SemanticVisualizer.
 
 Usage:
-    python main_semantic.py <source_file> [options]
+    python main_semantic.py <source_file> [<source_file> ...] [options]
 
 Options:
     -v, --verbose  Show detailed pattern information and violations
-    --json         Output full results as JSON
+    --json         Output full results as JSON (compact)
+    --json-pretty  Output full results as indented JSON
+                   (with --json/--json-pretty the visual report is only shown with --verbose)
+    -j, --jobs N   Number of worker processes for multiple files (default: CPU count)
 
 Examples:
     python main_semantic.py examples/example.tonto
     python main_semantic.py examples/example.tonto --verbose
     python main_semantic.py examples/example.tonto --json
+    python main_semantic.py examples/example.tonto --json-pretty
+    python main_semantic.py examples/example.tonto examples/example2.tonto
+    python main_semantic.py examples/**/*.tonto --json --jobs 4
 """
 
 from lexer.MyLexer import MyLexer
 from parser.MyParser import MyParser
 from parser.ParserSemantic import ParserSemantic
 from parser.SemanticVisualizer import print_semantic_report
+from concurrent.futures import ProcessPoolExecutor
+import argparse
 import json
 import sys
 import os
 
 
-def main():
+# Régua do cabeçalho da saída JSON
+_RULER = "=" * 60
+
+# Subconjunto público do resultado serializado em JSON (o restante é interno ao visualizador)
+_JSON_KEEP = ("summary", "files")
+_JSON_FILE_KEEP = ("filename", "symbols", "patterns", "incomplete_patterns", "errors", "warnings")
+
+
+def _json_view(result):
     """
-    Ponto de entrada principal.
-    
-    Processa argumentos da linha de comando, executa análise léxica,
-    sintática e semântica, e exibe resultados usando o visualizador.
+    Reduz o resultado da análise ao subconjunto público serializado em JSON.
+
+    Args:
+        result: Dict retornado por ParserSemantic.analyze()
+
+    Returns:
+        Dict contendo apenas as chaves de _JSON_KEEP, com cada arquivo reduzido a _JSON_FILE_KEEP
     """
-    if len(sys.argv) < 2:
-        print("Usage: python main_semantic.py <source_file> [options]")
-        print("\nRuns full compiler pipeline: Lexer -> Syntax Analysis -> Semantic Analysis")
-        print("\nOptions:")
-        print("  -v, --verbose  Show detailed pattern information and violations")
-        print("  --json         Output full results as JSON")
-        sys.exit(1)
+    view = {k: result[k] for k in _JSON_KEEP if k in result}
+    if "files" in view:
+        view["files"] = [{k: file_result[k] for k in _JSON_FILE_KEEP if k in file_result} for file_result in view["files"]]
+    return view
 
-    filepath = sys.argv[1]
 
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            code = f.read()
-    except FileNotFoundError:
-        print(f"Error: File '{filepath}' not found")
-        sys.exit(1)
+# Pipeline (lexer, parser, analisador) do processo atual, construído uma vez por processo
+_pipeline = None
+
+
+def _build_pipeline(error_details=True):
+    """
+    Constrói o pipeline do processo atual (usado também como initializer dos workers).
+
+    A construção das tabelas do PLY acontece uma única vez por processo e
+    é reaproveitada por todos os arquivos analisados nele. Sem relatório visual
+    (error_details=False) os erros sintáticos não têm contexto formatado.
+    """
+    global _pipeline
+    if _pipeline is None:
+        lexer = MyLexer()
+        lexer.build()
 
-    # Inicializar lexer
-    lexer = MyLexer()
-    lexer.build()
+        # Tabelas LR vêm do cache em pickle (gravação atômica, segura entre workers); sem parsetab.py
+        parser = MyParser(lexer, error_details=error_details)
+        parser.build()
 
-    # Inicializar parser
-    parser = MyParser(lexer)
-    parser.build(debug=False)
+        _pipeline = (lexer, parser, ParserSemantic())
 
-    # Executar análise sintática
+
+def _analyze_one(filepath):
+    """
+    Executa o pipeline completo para um arquivo.
+
+    Args:
+        filepath: Caminho do arquivo .tonto
+
+    Returns:
+        Tupla (result, lexer_errors, parser_errors)
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir
+    """
+    _build_pipeline()
+    lexer, parser, semantic = _pipeline
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        code = f.read()
+
+    # Executar análise sintática (erros do arquivo anterior são descartados)
+    parser.errors = []
     ast = parser.parse(code, filename=os.path.abspath(filepath))
 
     # Executar análise semântica
-    semantic = ParserSemantic()
     result = semantic.analyze(ast, filename=filepath)
 
-    # Adicionar erros do lexer/parser ao resultado para o visualizador
-    result["lexer_errors"] = lexer.errors
-    result["parser_errors"] = parser.errors
+    return result, lexer.errors, parser.errors
 
-    # Verificar modo verbose
-    verbose = "--verbose" in sys.argv or "-v" in sys.argv
 
-    # Imprimir relatório visual
-    print_semantic_report(result, filepath, verbose=verbose)
+def main():
+    """
+    Ponto de entrada principal.
+    
+    Processa argumentos da linha de comando, executa análise léxica,
+    sintática e semântica, e exibe resultados usando o visualizador.
+    """
+    arg_parser = argparse.ArgumentParser(
+        prog="main_semantic.py",
+        description="Runs full compiler pipeline: Lexer -> Syntax Analysis -> Semantic Analysis",
+    )
+    arg_parser.add_argument("files", nargs="+", metavar="source_file", help="Tonto source file(s) to analyze")
+    arg_parser.add_argument("-v", "--verbose", action="store_true", help="Show detailed pattern information and violations")
+    arg_parser.add_argument("--json", action="store_true", help="Output full results as JSON (compact)")
+    arg_parser.add_argument("--json-pretty", action="store_true", help="Output full results as indented JSON")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes for multiple files (default: CPU count)")
+    args = arg_parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        arg_parser.error(f"argument -j/--jobs: must be at least 1 (got {args.jobs})")
+
+    # Com saída JSON o relatório visual só é montado em modo verbose (JSON normalmente é redirecionado)
+    json_output = args.json or args.json_pretty
+    show_report = not json_output or args.verbose
+
+    # Um único arquivo (ou --jobs 1) roda no próprio processo; vários arquivos são distribuídos entre workers
+    if len(args.files) == 1 or args.jobs == 1:
+        executor = None
+        _build_pipeline(show_report)
+        reports = map(_analyze_one, args.files)
+    else:
+        executor = ProcessPoolExecutor(max_workers=args.jobs, initializer=_build_pipeline, initargs=(show_report,))
+        reports = executor.map(_analyze_one, args.files)
 
-    # Saída JSON se solicitada
-    if "--json" in sys.argv:
-        print("\n" + "=" * 60)
-        print("FULL JSON OUTPUT")
-        print("=" * 60)
-        # Remover erros do lexer/parser antes de serializar (já mostrados no visualizador)
-        result_copy = {k: v for k, v in result.items() if k not in ("lexer_errors", "parser_errors")}
-        print(json.dumps(result_copy, indent=2))
+    try:
+        # Relatórios são emitidos na ordem dos arquivos informados
+        for filepath in args.files:
+            try:
+                result, lexer_errors, parser_errors = next(reports)
+            except FileNotFoundError:
+                print(f"Error: File '{filepath}' not found")
+                sys.exit(1)
+
+            # Imprimir relatório visual
+            if show_report:
+                print_semantic_report(result, filepath, lexer_errors, parser_errors, verbose=args.verbose)
+
+            # Saída JSON se solicitada
+            if json_output:
+                if show_report:
+                    print("\n" + _RULER)
+                    print("FULL JSON OUTPUT")
+                    print(_RULER)
+                if args.json_pretty:
+                    print(json.dumps(_json_view(result), indent=2))
+                else:
+                    print(json.dumps(_json_view(result), separators=(",", ":")))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
 
 # Recomendação pra teste:
@@ -1,30 +1,294 @@
+import copy
+import glob
+import hashlib
+import os
+import pickle
+import pickletools
+import sys
+import warnings
+
 import ply.yacc as yacc
 
 from lexer.TokenType import _is_similar, tokens
 
+# Caminho padrão do cache das tabelas LR (o digest da gramática é acrescentado ao nome)
+PARSER_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parsetab.pickle")
+
+# Valores de "node_type" dos nós da AST (uma única instância de cada string, compartilhada por todos os nós)
+NT_TONTO_FILE = "tonto_file"
+NT_IMPORT_STATEMENT = "import_statement"
+NT_PACKAGE_DECLARATION = "package_declaration"
+NT_CLASS_DEFINITION = "class_definition"
+NT_INTERNAL_RELATION = "internal_relation"
+NT_ATTRIBUTE = "attribute"
+NT_CARDINALITY = "cardinality"
+NT_META_ATTRIBUTES = "meta_attributes"
+NT_DATATYPE_DEFINITION = "datatype_definition"
+NT_ENUM_DEFINITION = "enum_definition"
+NT_GENSET_DEFINITION = "genset_definition"
+NT_EXTERNAL_RELATION = "external_relation"
+NT_SPECIALIZATION = "specialization"
+
+# Erro de fim de arquivo: tudo fixo exceto o nome do arquivo (copiado em p_error)
+_EOF_ERROR = {
+    "type": "SyntaxError",
+    "token": "EOF",
+    "token_type": "EOF",
+    "line": "EOF",
+    "column": 0,
+    "line_text": "",
+    "pointer": "",
+    "filename": "<unknown>",
+    "message": "Unexpected end of file. Check for unclosed braces or incomplete statements.",
+    "expected": (),
+    "recommendation": "Ensure all '{' have matching '}' and all statements are complete.",
+}
+
+# (disjoint, complete) para cada sequência válida de modificadores de genset, em qualquer ordem
+_GENSET_FLAGS = {
+    (): (False, False),
+    ("disjoint",): (True, False),
+    ("complete",): (False, True),
+    ("disjoint", "complete"): (True, True),
+    ("complete", "disjoint"): (True, True),
+}
+
+
+def _similarity_buckets(words, threshold=2):
+    """
+    Agrupa as palavras pelo comprimento do token que pode se parecer com elas: _is_similar descarta de cara
+    diferenças de comprimento acima do limiar, então só o balde do comprimento do token precisa ser testado.
+    Cada balde mantém a ordem original (a primeira palavra parecida é a sugerida) com a forma minúscula pronta.
+    """
+    buckets = {}
+    for word in words:
+        for length in range(max(len(word) - threshold, 0), len(word) + threshold + 1):
+            buckets.setdefault(length, []).append((word, word.lower()))
+    return {length: tuple(candidates) for length, candidates in buckets.items()}
+
+
+# Rótulo dos tokens com nome fixo nas mensagens de "Expected": token -> (grupo, rótulo), grupos na ordem
+# palavras-chave (0), estereótipos (1), operadores (2), outros (3). Demais tokens são tratados em _format_expected_tokens
+_EXPECTED_LABELS = {
+    "CLASS_STEREOTYPE": (1, "class stereotype"),  # Token único para todos os estereótipos de classe
+    "RELATION_STEREOTYPE": (1, "relation stereotype"),  # Token único para todos os estereótipos de relação
+    "ASSOCIATION": (2, "--/-->/etc."),
+    "ASSOCIATIONL": (2, "--/-->/etc."),
+    "ASSOCIATIONR": (2, "--/-->/etc."),
+    "ASSOCIATIONLR": (2, "--/-->/etc."),
+    "AGGREGATIONL": (2, "<>--/--<>"),
+    "AGGREGATIONR": (2, "<>--/--<>"),
+    "COMPOSITIONL": (2, "<o>--/--<o>"),
+    "COMPOSITIONR": (2, "<o>--/--<o>"),
+    "CLASS_NAME": (3, "ClassName (PascalCase)"),
+    "RELATION_NAME": (3, "relationName (camelCase)"),
+    "INSTANCE_NAME": (3, "instanceName01 (with number)"),
+    "IDENTIFIER": (3, "identifier"),
+    "NUMBER": (3, "number"),
+}
+
+# Opções do yacc com que as tabelas em cache são geradas; qualquer outra opção (debug=True, write_tables=True,
+# errorlog...) pede uma geração nova, já que o efeito dela (parser.out, avisos, arquivos) só ocorre ao gerar
+_CACHED_TABLE_OPTIONS = {"write_tables": False, "debug": False}
+
+# Resultado das alternativas vazias, compartilhado por todas as seções opcionais sem conteúdo (imutável: nunca é estendido)
+_EMPTY = ()
+
 
 class MyParser:
     """
     Analisador sintático para a linguagem personalizada.
+
+    Os nós da AST são dicts simples (com "node_type" em NT_*): o ParserSemantic os lê com .get() e a
+    API do viewer os serializa diretamente para JSON, então classes com __slots__ ou tabelas de nós
+    exigiriam uma conversão de volta para dict em cada consumidor.
+
+    A análise não usa memoização: o LALR(1) nunca retrocede, então cada token é visto uma única vez e um
+    cache de resultados por regra só acrescentaria memória e consultas. Os únicos caches são os que
+    dependem apenas da gramática (tabelas LR e tokens esperados por estado).
     """
 
     tokens = tokens
+    _parser_cache = {}  # Parsers já construídos (sem métodos associados), indexados pelo digest da gramática
 
-    def __init__(self, lexer):
-        """Inicializa o analisador sintático."""
+    def __init__(self, lexer, error_details=True, max_errors=100):
+        """
+        Inicializa o analisador sintático.
+
+        Com error_details=False os erros registram apenas posição, token, mensagem e tokens esperados (sem
+        line_text, pointer nem recomendação), para quem só lê a mensagem ou conta os erros.
+        Ao atingir max_errors erros de sintaxe a análise é interrompida (None desativa o limite), para que
+        uma entrada que nunca se recupera não acumule erros em cascata indefinidamente.
+        """
         self.lexer = lexer  # Instância do analisador léxico
+        self.error_details = error_details  # Formatar contexto e recomendação de cada erro
+        self.max_errors = max_errors  # Limite de erros antes de interromper a análise
         self.parser = None  # Instância do parser PLY
         self.errors = []  # Lista de erros encontrados
         self.filename = None  # Nome do arquivo sendo processado
+        self._expected_cache = {}  # Tokens esperados (e seu texto) por estado LALR; tabelas não mudam após o build
+        self._stopped = False  # max_errors atingido na análise atual (erro de interrupção já registrado)
+
+    def build(self, cache_path=PARSER_CACHE_PATH, **kwargs):
+        """
+        Constrói o analisador sintático.
+
+        As tabelas LR ficam em cache na classe, indexadas pelo digest da gramática: instâncias seguintes
+        (um parser por arquivo, servidor de longa duração) apenas clonam o parser já construído.
+        Na primeira construção do processo as tabelas vêm do pickle em cache_path (o digest entra no nome
+        do arquivo, então mudar qualquer regra invalida o cache); só quando ele falta ou está inválido o
+        PLY gera as tabelas novamente. cache_path=None desativa o cache em disco.
+
+        Opções do yacc diferentes das usadas no cache (ex.: debug=True) ignoram os dois caches e geram as
+        tabelas nesta chamada, para que parser.out e os avisos do PLY sejam produzidos.
+        """
+        self._expected_cache = {}  # Novas tabelas: tokens esperados precisam ser recalculados
+        if not kwargs.items() <= _CACHED_TABLE_OPTIONS.items():
+            self.parser = self._generate_parser(**kwargs)
+            return self.parser
+
+        digest = self.grammar_digest()
+        template = MyParser._parser_cache.get(digest)
+        if template is None:
+            template = self._load_parser_template(cache_path, **kwargs)
+            MyParser._parser_cache[digest] = template
+
+        self.parser = self._clone_parser(template)
+        self._bind_parser_callables()
+        return self.parser
+
+    @classmethod
+    def cache_file(cls, cache_path=PARSER_CACHE_PATH):
+        """
+        Retorna o arquivo de cache usado por build() para a gramática atual (digest acrescentado ao nome).
+
+        Permite gerar o cache antes da distribuição (ex.: viewer.spec) e embarcar apenas o arquivo atual.
+        """
+        root, ext = os.path.splitext(cache_path)
+        return f"{root}-{cls.grammar_digest()[:16]}{ext or '.pickle'}"
+
+    def _load_parser_template(self, cache_path, **kwargs):
+        """Carrega as tabelas do pickle em disco ou as gera com o PLY, sem métodos associados."""
+        cache_file = None
+        if cache_path is not None:
+            cache_file = self.cache_file(cache_path)
+            try:
+                with open(cache_file, "rb") as f:
+                    return pickle.load(f)  # Tabelas já geradas em execução anterior
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                pass
+
+        template = self._generate_parser(**kwargs)
+        for prod in template.productions:
+            prod.callable = None  # O modelo é compartilhado: cada clone associa os métodos da sua instância
+        template.errorfunc = None
+        if cache_file is not None:
+            self._write_parser_cache(template, cache_file)
+            self._remove_stale_caches(cache_path, cache_file)
+        return template
+
+    @staticmethod
+    def _clone_parser(template):
+        """Copia o parser compartilhando as tabelas action/goto (somente leitura) e duplicando as produções."""
+        parser = copy.copy(template)
+        parser.productions = [copy.copy(prod) for prod in template.productions]
+        return parser
+
+    def _generate_parser(self, **kwargs):
+        """
+        Gera as tabelas LR com o PLY e valida a forma das regras de lista.
+
+        Por padrão nada é gravado em disco (nem parsetab.py nem parser.out): a persistência das tabelas fica
+        com o cache em pickle. Com debug=True o parser.out é escrito ao lado deste módulo e os avisos do PLY
+        (tokens sem uso, conflitos) aparecem no stderr; fora do modo debug eles são descartados.
+        """
+        options = {"write_tables": False, "debug": False, **kwargs}
+        if not options["debug"]:
+            options.setdefault("errorlog", yacc.NullLogger())
+        parser = yacc.yacc(module=self, **options)
+        self._check_left_recursion(parser)
+        return parser
+
+    @staticmethod
+    def _check_left_recursion(parser):
+        """
+        Emite um aviso para cada produção recursiva à direita (X : ... X).
+
+        Listas escritas como `lista : item lista` obrigam o LALR a empilhar todos os N itens antes da
+        primeira redução (pilha O(N)); na forma `lista : lista item` cada item é reduzido assim que lido.
+        """
+        for prod in parser.productions:
+            rhs = prod.str.split("->", 1)[1].split()
+            if len(rhs) > 1 and rhs[-1] == prod.name:
+                warnings.warn(f"Right-recursive production in {prod.func}: '{prod.str}' (prefer left recursion)", stacklevel=3)
+
+    @classmethod
+    def grammar_digest(cls):
+        """
+        Retorna o hash (sha256) das regras de produção e da lista de tokens.
 
-    def build(self, **kwargs):
-        """Constrói o analisador sintático."""
-        self.parser = yacc.yacc(module=self, outputdir="parser/", **kwargs)  # Cria o parser PLY
-        return self.parser  # Retorna a instância do parser
+        As docstrings p_* só são percorridas uma vez por classe; subclasses que redefinem regras
+        têm seu próprio digest (a consulta usa cls.__dict__, não o valor herdado).
+        """
+        cached = cls.__dict__.get("_grammar_digest")
+        if cached is not None:
+            return cached
+
+        digest = hashlib.sha256()
+        digest.update(" ".join(cls.tokens).encode())
+        for name in sorted(dir(cls)):
+            if name.startswith("p_") and name != "p_error":
+                digest.update((getattr(cls, name).__doc__ or "").encode())
+        cls._grammar_digest = digest.hexdigest()
+        return cls._grammar_digest
+
+    @staticmethod
+    def _write_parser_cache(parser, cache_file):
+        """Grava o parser em pickle (as produções já chegam sem os métodos p_*, reassociados a cada carga)."""
+        data = pickletools.optimize(pickle.dumps(parser, protocol=5))
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+            with open(tmp_file, "wb") as f:
+                f.write(data)
+            os.replace(tmp_file, cache_file)  # Troca atômica: outro processo nunca lê um arquivo pela metade
+        except OSError:
+            pass  # Sem permissão de escrita: o parser continua funcionando, apenas sem cache
+
+    @staticmethod
+    def _remove_stale_caches(cache_path, cache_file):
+        """
+        Apaga os caches de gramáticas anteriores ao lado de cache_file (mesmo nome, outro digest).
+
+        Cada mudança na gramática gera um arquivo novo; sem a limpeza os antigos se acumulariam no diretório
+        (que fica no .gitignore, então passariam despercebidos). Só nomes no formato <raiz>-<digest>.<ext> são
+        considerados. Gramáticas diferentes (ex.: subclasses) devem usar cache_path próprios.
+        """
+        root, ext = os.path.splitext(cache_path)
+        pattern = f"{glob.escape(root)}-{'[0-9a-f]' * 16}{ext or '.pickle'}"
+        for stale_file in glob.glob(pattern):
+            if os.path.abspath(stale_file) != os.path.abspath(cache_file):
+                try:
+                    os.remove(stale_file)
+                except OSError:
+                    pass  # Em uso ou sem permissão: fica para a próxima gravação
+
+    def _bind_parser_callables(self):
+        """Associa as produções e o tratamento de erro do parser a esta instância."""
+        for prod in self.parser.productions:
+            if prod.func:
+                prod.callable = getattr(self, prod.func)
+        self.parser.errorfunc = self.p_error
 
     def parse(self, data, filename=None):
-        """Analisa os dados de entrada e retorna a árvore sintática."""
+        """
+        Analisa os dados de entrada e retorna a árvore sintática.
+
+        Usa o laço sem rastreamento de posições do PLY (tracking=False, o mais rápido). O backend não é
+        trocado (ex.: Lark): p_error e as recomendações dependem do estado LALR e dos nomes de token do PLY.
+        """
         self.filename = filename  # Armazena o nome do arquivo
+        self._stopped = False  # Cada análise pode ser interrompida (e registrar a interrupção) uma vez
         self.lexer.input(data, filename)  # Fornece os dados ao lexer
         result = self.parser.parse(lexer=self.lexer.lexer)  # Executa a análise sintática
         return result  # Retorna a árvore sintática
@@ -37,7 +301,7 @@ class MyParser:
     def p_tonto_file(self, p):
         """tonto_file : import_section package_declaration package_content"""
         p[0] = {
-            "node_type": "tonto_file",
+            "node_type": NT_TONTO_FILE,
             "imports": p[1],  # Lista de imports
             "package": p[2],  # Declaração do package
             "content": p[3],  # Conteúdo do package
@@ -47,246 +311,192 @@ class MyParser:
     # Seção de imports (opcional)
 
     def p_import_section(self, p):
-        """import_section : import_list
-        | empty"""
-        if p[1] is None:  # Sem imports
-            p[0] = []
-        else:  # Lista de imports
-            p[0] = p[1]
+        """import_section : import_list"""
+        p[0] = p[1]  # Lista de imports
+
+    def p_import_section_empty(self, p):
+        """import_section :"""
+        # Alternativa vazia escrita aqui mesmo (sem regra "empty" intermediária): uma redução a menos
+        p[0] = _EMPTY
 
     def p_import_list(self, p):
         """import_list : import_list import_statement
         | import_statement"""
         if len(p) == 3:  # Múltiplos imports
-            p[0] = p[1] + [p[2]]
+            # A lista parcial só é lida pela próxima redução desta mesma regra (LR bottom-up),
+            # então pode ser estendida no lugar em vez de copiada a cada item
+            p[1].append(p[2])
+            p[0] = p[1]
         else:  # Único import
             p[0] = [p[1]]
 
     def p_import_statement(self, p):
         """import_statement : KEYWORD_IMPORT module_name"""
-        p[0] = {"node_type": "import_statement", "module_name": p[2], "line": p.lineno(2), "column": self.find_column(p, 2)}
+        p[0] = {"node_type": NT_IMPORT_STATEMENT, "module_name": p[2], "line": p.lineno(2), "column": self.find_column(p, 2)}
 
     # ======================================= PACKAGE DECLARATION & CONTENT ======================================= #
     # Declaração do package e seu conteúdo
 
     def p_package_declaration(self, p):
         """package_declaration : KEYWORD_PACKAGE package_name"""
-        p[0] = {"node_type": "package_declaration", "package_name": p[2], "line": p.lineno(2), "column": self.find_column(p, 2)}
+        p[0] = {"node_type": NT_PACKAGE_DECLARATION, "package_name": p[2], "line": p.lineno(2), "column": self.find_column(p, 2)}
 
     def p_package_content(self, p):
-        """package_content : definition_list
-        | empty"""
-        if p[1] is None:  # Pacote vazio
-            p[0] = []
-        else:  # Lista de definições
-            p[0] = p[1]
+        """package_content : definition_list"""
+        p[0] = p[1]  # Lista de definições
+
+    def p_package_content_empty(self, p):
+        """package_content :"""
+        p[0] = _EMPTY  # Pacote vazio (ver p_import_section_empty)
 
     # ======================================= DEFINITIONS ======================================= #
     # Definitions podem ser classes, datatypes ou enums
 
     def p_definition_list(self, p):
-        """definition_list : definition_list definition
-        | definition"""
-        if len(p) == 3:  # Múltiplas definições
-            p[0] = p[1] + [p[2]]
-        else:  # Única definição
-            p[0] = [p[1]]
-
-    def p_definition(self, p):
-        """definition : class_definition
+        """definition_list : definition_list class_definition
+        | definition_list datatype_definition
+        | definition_list enum_definition
+        | definition_list genset_definition
+        | definition_list external_relation
+        | class_definition
         | datatype_definition
         | enum_definition
         | genset_definition
-        | external_relation
-        """
-        p[0] = p[1]
+        | external_relation"""
+        # Os tipos de definição são alternativas diretas da lista: sem uma regra "definition"
+        # intermediária, cada definição economiza uma redução que só repassaria p[1]
+        if len(p) == 3:  # Múltiplas definições (lista estendida no lugar, ver p_import_list)
+            p[1].append(p[2])
+            p[0] = p[1]
+        else:  # Única definição
+            p[0] = [p[1]]
 
     # ======================================= CLASS DEFINITION ======================================= #
     # Definição de classes com estereótipos, especializações e corpo
 
-    def p_class_definition(self, p):
-        """class_definition : class_stereotype class_name
-        | class_stereotype class_name specialization
-        | class_stereotype class_name '{' '}'
-        | class_stereotype class_name '{' class_body '}'
-        | class_stereotype class_name specialization '{' '}'
-        | class_stereotype class_name specialization '{' class_body '}'"""
-
-        stereotype = p[1]
-        name = p[2]
-        body = None
-        specialization = None
+    # As alternativas são agrupadas pelo formato do corpo: cada ação sabe de antemão onde estão
+    # specialization e class_body, sem inspecionar p[3] para distinguir '{' de uma especialização
 
-        if len(p) == 3:  # stereotype class_name
-            pass
-        elif len(p) == 4:  # stereotype class_name specialization
-            specialization = p[3]
-        elif len(p) == 5:  # stereotype class_name '{' '}'
-            body = []
-        elif len(p) == 6:  # stereotype class_name '{' class_body '}'
-            if p[3] == "{":
-                body = p[4]
-            else:  # stereotype class_name specialization '{' '}'
-                specialization = p[3]
-                body = []
-        elif len(p) == 7:  # stereotype class_name specialization '{' class_body '}'
-            specialization = p[3]
-            body = p[5]
-
-        p[0] = {
-            "node_type": "class_definition",
-            "class_stereotype": stereotype,
-            "class_name": name,
+    def p_class_definition(self, p):
+        """class_definition : CLASS_STEREOTYPE class_name
+        | CLASS_STEREOTYPE class_name specialization"""
+        p[0] = self._class_node(p, p[3] if len(p) == 4 else None, None)
+
+    def p_class_definition_body(self, p):
+        """class_definition : CLASS_STEREOTYPE class_name '{' '}'
+        | CLASS_STEREOTYPE class_name '{' class_body '}'"""
+        p[0] = self._class_node(p, None, p[4] if len(p) == 6 else [])
+
+    def p_class_definition_specialized_body(self, p):
+        """class_definition : CLASS_STEREOTYPE class_name specialization '{' '}'
+        | CLASS_STEREOTYPE class_name specialization '{' class_body '}'"""
+        p[0] = self._class_node(p, p[3], p[5] if len(p) == 7 else [])
+
+    def _class_node(self, p, specialization, body):
+        """Monta o nó de classe (estereótipo em p[1], nome em p[2])."""
+        return {
+            "node_type": NT_CLASS_DEFINITION,
+            "class_stereotype": p[1],  # Já internado pelo lexer
+            "class_name": p[2],
             "specialization": specialization,
             "body": body,
             "line": p.lineno(2),
             "column": self.find_column(p, 2),
         }
 
-    def p_class_stereotype(self, p):
-        """class_stereotype : CLASS_EVENT
-        | CLASS_SITUATION
-        | CLASS_PROCESS
-        | CLASS_CATEGORY
-        | CLASS_MIXIN
-        | CLASS_PHASEMIXIN
-        | CLASS_ROLEMIXIN
-        | CLASS_HISTORICALROLEMIXIN
-        | CLASS_KIND
-        | CLASS_COLLECTIVE
-        | CLASS_QUANTITY
-        | CLASS_QUALITY
-        | CLASS_MODE
-        | CLASS_INTRISICMODE
-        | CLASS_EXTRINSICMODE
-        | CLASS_SUBKIND
-        | CLASS_PHASE
-        | CLASS_ROLE
-        | CLASS_HISTORICALROLE
-        | KEYWORD_RELATOR"""
-        p[0] = p[1]
-
     def p_class_body(self, p):
-        """class_body : class_body_item
-        | class_body class_body_item"""
+        """class_body : attribute
+        | internal_relation
+        | class_body attribute
+        | class_body internal_relation"""
+        # Itens do corpo são alternativas diretas (sem uma regra class_body_item que só repassaria p[1])
 
         if len(p) == 2:  # Único item no corpo da classe
             p[0] = [p[1]]
-        else:  # Múltiplos itens no corpo da classe
-            p[0] = p[1] + [p[2]]
+        else:  # Múltiplos itens no corpo da classe (lista estendida no lugar, ver p_import_list)
+            p[1].append(p[2])
+            p[0] = p[1]
 
-    def p_class_body_item(self, p):
-        """class_body_item : attribute
-        | internal_relation"""
-        p[0] = p[1]
+    # Relação interna: um reducer por formato (nomeada ou não, com ou sem cardinalidade inicial), cada um lendo
+    # posições fixas, sem despacho por len(p). first_end é null para relações internas (implícito da classe que contém)
 
-    def p_internal_relation(self, p):
+    def p_internal_relation_named(self, p):
         """internal_relation : relation_stereotype_optional relation_operator_left relation_name \
-relation_operator_right cardinality class_name
-                             | relation_stereotype_optional cardinality relation_operator_left relation_name \
-relation_operator_right cardinality class_name
-                             | relation_stereotype_optional relation_operator_left cardinality class_name
-                             | relation_stereotype_optional cardinality relation_operator_left cardinality class_name"""
-
-        # Formato 1: @stereotype -- relationName -- [1] SecondEnd          (len=7, nomeada, sem card. inicial)
-        # Formato 2: @stereotype [1] -- relationName -- [1..*] SecondEnd   (len=8, nomeada, com card. inicial)
-        # Formato 3: @stereotype -- [1] SecondEnd                          (len=5, sem nome, sem card. inicial)
-        # Formato 4: @stereotype [1..*] -- [1] SecondEnd                   (len=6, sem nome, com card. inicial)
-        # Nota: first_end é null para relações internas (implícito da classe que contém)
-
-        if len(p) == 8:  # Formato 2: nomeada com cardinalidade inicial
-            p[0] = {
-                "node_type": "internal_relation",
-                "relation_stereotype": p[1],
-                "first_end": None,
-                "first_cardinality": p[2],
-                "operator_left": p[3],
-                "relation_name": p[4],
-                "operator_right": p[5],
-                "second_cardinality": p[6],
-                "second_end": p[7],
-                "line": p.lineno(4),
-                "column": self.find_column(p, 4),
-            }
-        elif len(p) == 7:  # Formato 1: nomeada sem cardinalidade inicial
-            p[0] = {
-                "node_type": "internal_relation",
-                "relation_stereotype": p[1],
-                "first_end": None,
-                "first_cardinality": None,
-                "operator_left": p[2],
-                "relation_name": p[3],
-                "operator_right": p[4],
-                "second_cardinality": p[5],
-                "second_end": p[6],
-                "line": p.lineno(3),
-                "column": self.find_column(p, 3),
-            }
-        elif len(p) == 6:  # Formato 4: sem nome com cardinalidade inicial
-            p[0] = {
-                "node_type": "internal_relation",
-                "relation_stereotype": p[1],
-                "first_end": None,
-                "first_cardinality": p[2],
-                "operator_left": p[3],
-                "relation_name": None,
-                "operator_right": None,
-                "second_cardinality": p[4],
-                "second_end": p[5],
-                "line": p.lineno(5),
-                "column": self.find_column(p, 5),
-            }
-        else:  # len(p) == 5, Formato 3: sem nome sem cardinalidade inicial
-            p[0] = {
-                "node_type": "internal_relation",
-                "relation_stereotype": p[1],
-                "first_end": None,
-                "first_cardinality": None,
-                "operator_left": p[2],
-                "relation_name": None,
-                "operator_right": None,
-                "second_cardinality": p[3],
-                "second_end": p[4],
-                "line": p.lineno(4),
-                "column": self.find_column(p, 4),
-            }
+relation_operator_right cardinality class_name"""
+        # @stereotype -- relationName -- [1] SecondEnd
+        p[0] = {
+            "node_type": NT_INTERNAL_RELATION,
+            "relation_stereotype": p[1],
+            "first_end": None,
+            "first_cardinality": None,
+            "operator_left": p[2],
+            "relation_name": p[3],
+            "operator_right": p[4],
+            "second_cardinality": p[5],
+            "second_end": p[6],
+            "line": p.lineno(3),
+            "column": self.find_column(p, 3),
+        }
+
+    def p_internal_relation_named_with_cardinality(self, p):
+        """internal_relation : relation_stereotype_optional cardinality relation_operator_left relation_name \
+relation_operator_right cardinality class_name"""
+        # @stereotype [1] -- relationName -- [1..*] SecondEnd
+        p[0] = {
+            "node_type": NT_INTERNAL_RELATION,
+            "relation_stereotype": p[1],
+            "first_end": None,
+            "first_cardinality": p[2],
+            "operator_left": p[3],
+            "relation_name": p[4],
+            "operator_right": p[5],
+            "second_cardinality": p[6],
+            "second_end": p[7],
+            "line": p.lineno(4),
+            "column": self.find_column(p, 4),
+        }
+
+    def p_internal_relation_unnamed(self, p):
+        """internal_relation : relation_stereotype_optional relation_operator_left cardinality class_name"""
+        # @stereotype -- [1] SecondEnd
+        p[0] = {
+            "node_type": NT_INTERNAL_RELATION,
+            "relation_stereotype": p[1],
+            "first_end": None,
+            "first_cardinality": None,
+            "operator_left": p[2],
+            "relation_name": None,
+            "operator_right": None,
+            "second_cardinality": p[3],
+            "second_end": p[4],
+            "line": p.lineno(4),
+            "column": self.find_column(p, 4),
+        }
+
+    def p_internal_relation_unnamed_with_cardinality(self, p):
+        """internal_relation : relation_stereotype_optional cardinality relation_operator_left cardinality class_name"""
+        # @stereotype [1..*] -- [1] SecondEnd
+        p[0] = {
+            "node_type": NT_INTERNAL_RELATION,
+            "relation_stereotype": p[1],
+            "first_end": None,
+            "first_cardinality": p[2],
+            "operator_left": p[3],
+            "relation_name": None,
+            "operator_right": None,
+            "second_cardinality": p[4],
+            "second_end": p[5],
+            "line": p.lineno(5),
+            "column": self.find_column(p, 5),
+        }
 
     def p_relation_stereotype_optional(self, p):
-        """relation_stereotype_optional : '@' relation_stereotype
-        | empty"""
-        if p[1] is None:  # Sem estereótipo
-            p[0] = None
-        else:  # Com estereótipo
-            p[0] = p[2]
-
-    def p_relation_stereotype(self, p):
-        """relation_stereotype : RELATION_MATERIAL
-        | RELATION_DERIVATION
-        | RELATION_COMPARATIVE
-        | RELATION_MEDIATION
-        | RELATION_CHARACTERIZATION
-        | RELATION_EXTERNALDEPENDENCE
-        | RELATION_COMPONENTOF
-        | RELATION_MEMBEROF
-        | RELATION_SUBCOLLECTIONOF
-        | RELATION_SUBQUALITYOF
-        | RELATION_INSTANTIATION
-        | RELATION_TERMINATION
-        | RELATION_PARTICIPATIONAL
-        | RELATION_PARTICIPATION
-        | RELATION_HISTORICALDEPENDENCE
-        | RELATION_CREATION
-        | RELATION_MANIFESTATION
-        | RELATION_BRINGSABOUT
-        | RELATION_TRIGGERS
-        | RELATION_COMPOSITION
-        | RELATION_AGGREGATION
-        | RELATION_INHERENCE
-        | RELATION_VALUE
-        | RELATION_FORMAL
-        | RELATION_CONSTITUTION
-        """
-        p[0] = p[1]
+        """relation_stereotype_optional : '@' RELATION_STEREOTYPE"""
+        p[0] = p[2]  # Já internado pelo lexer
+
+    def p_relation_stereotype_optional_empty(self, p):
+        """relation_stereotype_optional :"""
+        p[0] = None  # Sem estereótipo (ver p_import_section_empty)
 
     def p_relation_operator_left(self, p):
         """relation_operator_left : ASSOCIATION
@@ -294,7 +504,7 @@ relation_operator_right cardinality class_name
         | ASSOCIATIONLR
         | AGGREGATIONL
         | COMPOSITIONL"""
-        p[0] = p[1]
+        p[0] = sys.intern(p[1])
 
     def p_relation_operator_right(self, p):
         """relation_operator_right : ASSOCIATION
@@ -302,37 +512,30 @@ relation_operator_right cardinality class_name
         | ASSOCIATIONLR
         | AGGREGATIONR
         | COMPOSITIONR"""
-        p[0] = p[1]
+        p[0] = sys.intern(p[1])
 
     # ======================================= ATTRIBUTE DEFINITION ======================================= #
     # Definição de atributos com tipo, cardinalidade e meta-atributos
 
+    # Alternativas agrupadas pela presença de meta_attributes: a posição de cardinality e meta_attributes
+    # é conhecida em cada ação, sem testar o tipo de p[4] para distinguir um do outro
+
     def p_attribute(self, p):
         """attribute : attribute_name ':' type_reference
-        | attribute_name ':' type_reference cardinality
-        | attribute_name ':' type_reference meta_attributes
-        | attribute_name ':' type_reference cardinality meta_attributes"""
-
-        attr_name = p[1]
-        attr_type = p[3]
-        cardinality = None
-        meta_attributes = None
-
-        if len(p) == 4:  # attribute_name ':' type_reference
-            pass  # name: type
-        elif len(p) == 5:
-            if isinstance(p[4], dict) and p[4].get("node_type") == "cardinality":  # attribute_name ':' type_reference cardinality
-                cardinality = p[4]  # name: type [1..*]
-            else:  # attribute_name ':' type_reference meta_attributes
-                meta_attributes = p[4]  # name: type {const}
-        elif len(p) == 6:  # attribute_name ':' type_reference cardinality meta_attributes
-            cardinality = p[4]  # name: type [1..*] {const}
-            meta_attributes = p[5]
+        | attribute_name ':' type_reference cardinality"""
+        p[0] = self._attribute_node(p, p[4] if len(p) == 5 else None, None)  # name: type [1..*]
 
-        p[0] = {
-            "node_type": "attribute",
-            "attribute_name": attr_name,
-            "attribute_type": attr_type,
+    def p_attribute_meta(self, p):
+        """attribute : attribute_name ':' type_reference meta_attributes
+        | attribute_name ':' type_reference cardinality meta_attributes"""
+        p[0] = self._attribute_node(p, p[4] if len(p) == 6 else None, p[len(p) - 1])  # name: type [1..*] {const}
+
+    def _attribute_node(self, p, cardinality, meta_attributes):
+        """Monta o nó de atributo (nome em p[1], tipo em p[3])."""
+        return {
+            "node_type": NT_ATTRIBUTE,
+            "attribute_name": p[1],
+            "attribute_type": p[3],
             "cardinality": cardinality,
             "meta_attributes": meta_attributes,
             "line": p.lineno(1),
@@ -351,83 +554,72 @@ relation_operator_right cardinality class_name
         | TYPE_DATE
         | TYPE_TIME
         | TYPE_DATETIME"""
-        p[0] = p[1]
+        p[0] = p[1]  # Nomes de tipo já chegam internados do lexer
 
     # ======================================= CARDINALITY DEFINITION ======================================= #
     # Definição de cardinalidade para atributos
 
     def p_cardinality(self, p):
-        """cardinality : '[' cardinality_range ']'
-        | '[' cardinality_range CARDINALITY cardinality_range ']'"""
+        """cardinality : '[' NUMBER ']'
+        | '[' '*' ']'
+        | '[' NUMBER CARDINALITY NUMBER ']'
+        | '[' NUMBER CARDINALITY '*' ']'
+        | '[' '*' CARDINALITY NUMBER ']'
+        | '[' '*' CARDINALITY '*' ']'"""
+        # Limites (NUMBER ou '*') escritos direto nas alternativas, sem regra intermediária por limite
 
         if len(p) == 4:  # [ 1 ] or [ * ]
-            p[0] = {"node_type": "cardinality", "min": p[2], "max": p[2]}
+            p[0] = {"node_type": NT_CARDINALITY, "min": p[2], "max": p[2]}
         else:  # [ 1 .. * ]
-            p[0] = {"node_type": "cardinality", "min": p[2], "max": p[4]}
-
-    def p_cardinality_range(self, p):
-        """cardinality_range : NUMBER
-        | '*'"""
-        p[0] = p[1]
+            p[0] = {"node_type": NT_CARDINALITY, "min": p[2], "max": p[4]}
 
     # ======================================= META ATTRIBUTES ======================================= #
     # Definição de meta-atributos para atributos
 
     def p_meta_attributes(self, p):
         """meta_attributes : '{' meta_attribute_list '}'"""
-        p[0] = {"node_type": "meta_attributes", "attributes": p[2]}
+        p[0] = {"node_type": NT_META_ATTRIBUTES, "attributes": p[2]}
 
     def p_meta_attribute_list(self, p):
-        """meta_attribute_list : meta_attribute
-        | meta_attribute_list ',' meta_attribute"""
-        if len(p) == 2:  # Único meta-atributo
-            p[0] = [p[1]]
-        else:  # Múltiplos meta-atributos
-            p[0] = p[1] + [p[3]]
-
-    def p_meta_attribute(self, p):
-        """meta_attribute : META_ORDERED
+        """meta_attribute_list : META_ORDERED
         | META_CONST
         | META_DERIVED
         | META_SUBSETS
-        | META_REDEFINES"""
-
-        p[0] = p[1]
+        | META_REDEFINES
+        | meta_attribute_list ',' META_ORDERED
+        | meta_attribute_list ',' META_CONST
+        | meta_attribute_list ',' META_DERIVED
+        | meta_attribute_list ',' META_SUBSETS
+        | meta_attribute_list ',' META_REDEFINES"""
+        if len(p) == 2:  # Único meta-atributo
+            p[0] = [p[1]]
+        else:  # Múltiplos meta-atributos (lista estendida no lugar, ver p_import_list)
+            p[1].append(p[3])
+            p[0] = p[1]
 
     # ======================================= DATATYPE DEFINITION ======================================= #
     # Definição de datatypes com especializações e corpo
 
     def p_datatype_definition(self, p):
         """datatype_definition : KEYWORD_DATATYPE class_name
-        | KEYWORD_DATATYPE class_name specialization
-        | KEYWORD_DATATYPE class_name '{' '}'
-        | KEYWORD_DATATYPE class_name '{' datatype_body '}'
-        | KEYWORD_DATATYPE class_name specialization '{' '}'
-        | KEYWORD_DATATYPE class_name specialization '{' datatype_body '}'"""
+        | KEYWORD_DATATYPE class_name specialization"""
+        p[0] = self._datatype_node(p, p[3] if len(p) == 4 else None, None)
 
-        name = p[2]
-        body = None
-        specialization = None
+    def p_datatype_definition_body(self, p):
+        """datatype_definition : KEYWORD_DATATYPE class_name '{' '}'
+        | KEYWORD_DATATYPE class_name '{' datatype_body '}'"""
+        p[0] = self._datatype_node(p, None, p[4] if len(p) == 6 else [])
 
-        if len(p) == 3:  # datatype Nome
-            pass
-        elif len(p) == 4:  # datatype Nome specializes
-            specialization = p[3]
-        elif len(p) == 5:  # datatype Nome { }
-            body = []
-        elif len(p) == 6:
-            if p[3] == "{":  # datatype Nome { corpo }
-                body = p[4]
-            else:  # datatype Nome specializes { }
-                specialization = p[3]
-                body = []
-        elif len(p) == 7:  # datatype Nome specializes { corpo }
-            specialization = p[3]
-            body = p[5]
+    def p_datatype_definition_specialized_body(self, p):
+        """datatype_definition : KEYWORD_DATATYPE class_name specialization '{' '}'
+        | KEYWORD_DATATYPE class_name specialization '{' datatype_body '}'"""
+        p[0] = self._datatype_node(p, p[3], p[5] if len(p) == 7 else [])
 
-        p[0] = {
-            "node_type": "datatype_definition",
-            "datatype_name": name,
+    def _datatype_node(self, p, specialization, body):
+        """Monta o nó de datatype (nome em p[2]); alternativas agrupadas como em class_definition."""
+        return {
+            "node_type": NT_DATATYPE_DEFINITION,
+            "datatype_name": p[2],
             "specialization": specialization,
             "body": body,
             "line": p.lineno(2),
@@ -440,8 +632,9 @@ relation_operator_right cardinality class_name
 
         if len(p) == 2:  # Único atributo do datatype
             p[0] = [p[1]]
-        else:  # Múltiplos atributos do datatype
-            p[0] = p[1] + [p[2]]
+        else:  # Múltiplos atributos do datatype (lista estendida no lugar, ver p_import_list)
+            p[1].append(p[2])
+            p[0] = p[1]
 
     # ======================================= ENUM DEFINITION ======================================= #
     # Definição de enums com especializações e valores
@@ -461,7 +654,7 @@ relation_operator_right cardinality class_name
             values = p[5]
 
         p[0] = {
-            "node_type": "enum_definition",
+            "node_type": NT_ENUM_DEFINITION,
             "enum_name": name,
             "specialization": specialization,
             "values": values,
@@ -470,58 +663,49 @@ relation_operator_right cardinality class_name
         }
 
     def p_enum_values(self, p):
-        """enum_values : enum_value
-        | enum_values ',' enum_value"""
+        """enum_values : class_name
+        | enum_values ',' class_name"""
         if len(p) == 2:
             p[0] = [p[1]]  # Único valor
-        else:
-            p[0] = p[1] + [p[3]]  # Múltiplos valores
-
-    def p_enum_value(self, p):
-        """enum_value : class_name"""
-        p[0] = p[1]
+        else:  # Múltiplos valores (lista estendida no lugar, ver p_import_list)
+            p[1].append(p[3])
+            p[0] = p[1]
 
     # ======================================= GENSET DEFINITION ======================================= #
     # Definição de gensets com blocos ou forma curta
 
-    def p_genset_definition(self, p):
-        """genset_definition : genset_block
-        | genset_short"""
-
-        p[0] = p[1]
-
     def p_genset_block(self, p):
-        """genset_block : genset_modifiers KEYWORD_GENSET genset_name '{' genset_body '}'"""
+        """genset_definition : genset_modifiers KEYWORD_GENSET genset_name '{' genset_body '}'"""
 
-        modifiers = p[1]
+        disjoint, complete = p[1]
         name = p[3]
-        body = p[5]
+        general, categorizer, specifics = p[5]
 
         p[0] = {
-            "node_type": "genset_definition",
+            "node_type": NT_GENSET_DEFINITION,
             "genset_name": name,
-            "disjoint": modifiers["disjoint"],
-            "complete": modifiers["complete"],
-            "general": body["general"],
-            "categorizer": body["categorizer"],
-            "specifics": body["specifics"],
+            "disjoint": disjoint,
+            "complete": complete,
+            "general": general,
+            "categorizer": categorizer,
+            "specifics": specifics,
             "line": p.lineno(3),
             "column": self.find_column(p, 3),
         }
 
     def p_genset_short(self, p):
-        """genset_short : genset_modifiers KEYWORD_GENSET genset_name KEYWORD_WHERE class_name_list KEYWORD_SPECIALIZES class_name"""
+        """genset_definition : genset_modifiers KEYWORD_GENSET genset_name KEYWORD_WHERE class_name_list KEYWORD_SPECIALIZES class_name"""
 
-        modifiers = p[1]
+        disjoint, complete = p[1]
         name = p[3]
         specifics = p[5]
         general = p[7]
 
         p[0] = {
-            "node_type": "genset_definition",
+            "node_type": NT_GENSET_DEFINITION,
             "genset_name": name,
-            "disjoint": modifiers["disjoint"],
-            "complete": modifiers["complete"],
+            "disjoint": disjoint,
+            "complete": complete,
             "general": general,
             "categorizer": None,
             "specifics": specifics,
@@ -530,92 +714,118 @@ relation_operator_right cardinality class_name
         }
 
     def p_genset_modifiers(self, p):
-        """genset_modifiers : KEYWORD_DISJOINT KEYWORD_COMPLETE
-        | KEYWORD_COMPLETE KEYWORD_DISJOINT
+        """genset_modifiers : genset_modifier_list"""
+
+        # Modificadores são um conjunto: a ordem em que aparecem não importa.
+        # Resultado intermediário (não entra na AST): tupla (disjoint, complete) desempacotada pelo genset
+        flags = _GENSET_FLAGS.get(tuple(p[1]))
+        if flags is None:  # Modificador repetido (já registrado em p_genset_modifier_list)
+            flags = ("disjoint" in p[1], "complete" in p[1])
+        p[0] = flags
+
+    def p_genset_modifiers_empty(self, p):
+        """genset_modifiers :"""
+        p[0] = _GENSET_FLAGS[_EMPTY]  # Sem modificadores (ver p_import_section_empty)
+
+    def p_genset_modifier_list(self, p):
+        """genset_modifier_list : genset_modifier_list KEYWORD_DISJOINT
+        | genset_modifier_list KEYWORD_COMPLETE
         | KEYWORD_DISJOINT
-        | KEYWORD_COMPLETE
-        | empty"""
+        | KEYWORD_COMPLETE"""
 
-        if p[1] is None:  # Sem modificadores
-            p[0] = {"disjoint": False, "complete": False}
-        elif len(p) == 3:  # Ambos os modificadores // Não importa a ordem
-            p[0] = {"disjoint": True, "complete": True}
-
-        elif p[1] == "disjoint":  # Apenas disjoint
-            p[0] = {"disjoint": True, "complete": False}
-
-        elif p[1] == "complete":  # Apenas complete
-            p[0] = {"disjoint": False, "complete": True}
+        if len(p) == 2:  # Único modificador
+            p[0] = [p[1]]
+            return
+
+        # Múltiplos modificadores (lista estendida no lugar, ver p_import_list)
+        if p[2] in p[1]:  # Modificador repetido: a gramática aceita, o erro é registrado aqui
+            line_start, line_end, column = self._line_span(p, 2)  # Token terminal: sempre tem posição
+            self._record_error(
+                p.slice[2],
+                {
+                    "type": "SyntaxError",
+                    "token": p[2],
+                    "token_type": f"KEYWORD_{p[2].upper()}",
+                    "line": p.lineno(2),
+                    "column": column,
+                    "line_text": self.lexer.input_text[line_start:line_end] if self.error_details else "",
+                    "pointer": " " * (column - 1) + "^" if self.error_details else "",
+                    "filename": self.filename or "<unknown>",
+                    "message": f"Duplicate genset modifier '{p[2]}'",
+                    "expected": _EMPTY,
+                    "recommendation": "Use each of 'disjoint' and 'complete' at most once. Example: 'disjoint complete genset ...'",
+                },
+            )
+        p[1].append(p[2])
+        p[0] = p[1]
 
     def p_genset_body(self, p):
         """genset_body : KEYWORD_GENERAL class_name KEYWORD_SPECIFICS class_name_list
         | KEYWORD_GENERAL class_name KEYWORD_CATEGORIZER class_name KEYWORD_SPECIFICS class_name_list"""
 
+        # Tupla (general, categorizer, specifics), desempacotada em p_genset_block
         if len(p) == 5:  # Sem categorizer
-            p[0] = {"general": p[2], "categorizer": None, "specifics": p[4]}
+            p[0] = (p[2], None, p[4])
         else:  # Com categorizer
-            p[0] = {"general": p[2], "categorizer": p[4], "specifics": p[6]}
+            p[0] = (p[2], p[4], p[6])
 
     # ======================================= EXTERNAL RELATION ======================================= #
     # Relações externas definidas no nível do pacote (fora de classes)
 
-    def p_external_relation(self, p):
+    # Relação externa: um reducer por formato (com ou sem cardinalidade inicial), lendo posições fixas
+
+    def p_external_relation_with_cardinality(self, p):
         """external_relation : relation_stereotype_optional KEYWORD_RELATION class_name cardinality \
-relation_operator_left relation_name relation_operator_right cardinality class_name
-                             | relation_stereotype_optional KEYWORD_RELATION class_name \
 relation_operator_left relation_name relation_operator_right cardinality class_name"""
+        # @material relation Pizza [1..*] -- tem_Massa -- [1..*] Massa_Da_Pizza
+        # p[1]      p[2]     p[3]  p[4]   p[5] p[6]      p[7] p[8]  p[9]
+        p[0] = {
+            "node_type": NT_EXTERNAL_RELATION,
+            "relation_stereotype": p[1],
+            "first_end": p[3],
+            "first_cardinality": p[4],
+            "operator_left": p[5],
+            "relation_name": p[6],
+            "operator_right": p[7],
+            "second_cardinality": p[8],
+            "second_end": p[9],
+            "line": p.lineno(3),
+            "column": self.find_column(p, 3),
+        }
 
-        # Formato 1: @material relation Pizza [1..*] -- tem_Massa -- [1..*] Massa_Da_Pizza  (len=10, com card. inicial)
-        #           p[1]      p[2]     p[3]  p[4]   p[5] p[6]      p[7] p[8]  p[9]
-        # Formato 2: @material relation Pizza -- tem_Massa -- [1..*] Massa_Da_Pizza         (len=9, sem card. inicial)
-        #           p[1]      p[2]     p[3]  p[4] p[5]      p[6] p[7]  p[8]
-
-        if len(p) == 10:  # Formato 1: com cardinalidade inicial
-            p[0] = {
-                "node_type": "external_relation",
-                "relation_stereotype": p[1],
-                "first_end": p[3],
-                "first_cardinality": p[4],
-                "operator_left": p[5],
-                "relation_name": p[6],
-                "operator_right": p[7],
-                "second_cardinality": p[8],
-                "second_end": p[9],
-                "line": p.lineno(3),
-                "column": self.find_column(p, 3),
-            }
-        else:  # Formato 2: sem cardinalidade inicial (len=9)
-            p[0] = {
-                "node_type": "external_relation",
-                "relation_stereotype": p[1],
-                "first_end": p[3],
-                "first_cardinality": None,
-                "operator_left": p[4],
-                "relation_name": p[5],
-                "operator_right": p[6],
-                "second_cardinality": p[7],
-                "second_end": p[8],
-                "line": p.lineno(3),
-                "column": self.find_column(p, 3),
-            }
+    def p_external_relation(self, p):
+        """external_relation : relation_stereotype_optional KEYWORD_RELATION class_name \
+relation_operator_left relation_name relation_operator_right cardinality class_name"""
+        # @material relation Pizza -- tem_Massa -- [1..*] Massa_Da_Pizza
+        # p[1]      p[2]     p[3]  p[4] p[5]      p[6] p[7]  p[8]
+        p[0] = {
+            "node_type": NT_EXTERNAL_RELATION,
+            "relation_stereotype": p[1],
+            "first_end": p[3],
+            "first_cardinality": None,
+            "operator_left": p[4],
+            "relation_name": p[5],
+            "operator_right": p[6],
+            "second_cardinality": p[7],
+            "second_end": p[8],
+            "line": p.lineno(3),
+            "column": self.find_column(p, 3),
+        }
 
     # ======================================= GENERIC RULES ======================================= #
 
-    def p_empty(self, p):
-        """empty :"""
-        p[0] = None
-
     def p_specialization(self, p):
         """specialization : KEYWORD_SPECIALIZES class_name_list"""
-        p[0] = {"node_type": "specialization", "parents": p[2]}
+        p[0] = {"node_type": NT_SPECIALIZATION, "parents": p[2]}
 
     def p_identifier_list(self, p):
         """identifier_list : IDENTIFIER
         | identifier_list ',' IDENTIFIER"""
         if len(p) == 2:
             p[0] = [p[1]]  # Único identificador
-        else:
-            p[0] = p[1] + [p[3]]  # Múltiplos identificadores
+        else:  # Múltiplos identificadores (lista estendida no lugar, ver p_import_list)
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_class_name(self, p):
         """class_name : CLASS_NAME"""
@@ -665,8 +875,9 @@ relation_operator_left relation_name relation_operator_right cardinality class_n
         | class_name_list ',' class_name"""
         if len(p) == 2:
             p[0] = [p[1]]  # Único nome de classe
-        else:
-            p[0] = p[1] + [p[3]]  # Múltiplos nomes de classe
+        else:  # Múltiplos nomes de classe (lista estendida no lugar, ver p_import_list)
+            p[1].append(p[3])
+            p[0] = p[1]
 
     # ======================================= TRATAMENTO DE ERROS ======================================= #
 
@@ -760,33 +971,77 @@ relation_operator_left relation_name relation_operator_right cardinality class_n
     # Meta-atributos válidos para recomendações
     VALID_META_ATTRIBUTES = ["ordered", "const", "derived", "subsets", "redefines"]
 
+    # Recomendações fixas a partir dos tokens esperados, testadas em ordem em _get_recommendation:
+    # (algum destes tokens esperado, tipos de token que ativam a regra ou None para qualquer um, mensagem)
+    _EXPECTED_HINTS = (
+        # Nome do pacote faltando
+        (("IDENTIFIER", "CLASS_NAME"), ("{",), "Expected a name before '{'. Did you forget the identifier?"),
+        # Chave de fechamento faltando
+        (("'}'",), None, "Missing closing brace '}'. Check that all blocks are properly closed."),
+        # Chave de abertura faltando
+        (("'{'",), None, "Expected '{' to start a block body."),
+        # Dois pontos faltando no atributo
+        (("':'",), ("IDENTIFIER", "RELATION_NAME"), "Attribute declaration requires ':' between name and type. Example: 'name: String'"),
+        # Palavra-chave specializes faltando
+        (("KEYWORD_SPECIALIZES",), None, "Use 'specializes' keyword for inheritance. Example: 'subkind Child specializes Parent'"),
+        # Cardinalidade faltando
+        (("'['",), None, "Expected cardinality in brackets. Example: '[1..*]' or '[1]'"),
+        # Operador de relação faltando
+        (("ASSOCIATION", "ASSOCIATIONL"), None, "Expected relation operator: '--', '-->', '<--', '<-->', '<>--', '--<>', '<o>--', or '--<o>'"),
+        # General/specifics faltando no genset
+        (("KEYWORD_GENERAL",), None, "Genset body requires 'general' keyword. Example: 'general ParentClass'"),
+        (("KEYWORD_SPECIFICS",), None, "Genset body requires 'specifics' keyword. Example: 'specifics Child1, Child2'"),
+        # Vírgula faltando
+        (("','",), ("IDENTIFIER", "CLASS_NAME", "RELATION_NAME"), "Missing comma between items. Use ',' to separate multiple values."),
+        # Class name, relation name ou identificador esperado
+        (("CLASS_NAME",), None, "Expected a class name (PascalCase, starting with uppercase). Example: 'Person', 'CarOwnership'"),
+        (("RELATION_NAME",), None, "Expected a relation/attribute name (camelCase, starting with lowercase). Example: 'hasParent', 'name'"),
+        (("IDENTIFIER",), None, "Expected an identifier (name) at this position."),
+    )
+
+    # Busca exata de estereótipo de classe (o valor do token é comparado a cada erro)
+    _STEREOTYPE_SET = frozenset(VALID_STEREOTYPES)
+
+    # Candidatos a sugestão por comprimento do token, calculados uma vez por classe
+    _STEREOTYPE_BUCKETS = _similarity_buckets(VALID_STEREOTYPES)
+    _RELATION_STEREOTYPE_BUCKETS = _similarity_buckets(VALID_RELATION_STEREOTYPES)
+
+    def _line_span(self, p, token_index):
+        """
+        Retorna (início da linha, fim da linha, coluna) do símbolo, com uma única busca binária nos
+        inícios de linha do lexer. Símbolos sem posição (não terminais) retornam None.
+        """
+        # getattr com padrão em vez de try/except: não terminais (class_name, genset_name...) não têm lexpos,
+        # então o caso "sem posição" é frequente e levantar AttributeError a cada vez sairia mais caro
+        pos = getattr(p.slice[token_index], "lexpos", None)
+        if pos is None:
+            return None
+        return self._span_at(pos)
+
+    def _span_at(self, pos):
+        """Retorna (início da linha, fim da linha, coluna) da posição pos no texto de entrada."""
+        line_start, line_end = self.lexer.find_line_bounds(pos)  # Tabela de linhas calculada uma vez em lexer.input()
+        return line_start, line_end, pos - line_start + 1
+
     def find_column(self, p, token_index):
         """Retorna a coluna do token na linha."""
-        if not hasattr(p.slice[token_index], "lexpos"):
-            return 1
-        pos = p.slice[token_index].lexpos
-        line_start = self.lexer.input_text.rfind("\n", 0, pos) + 1
-        return (pos - line_start) + 1
+        span = self._line_span(p, token_index)
+        return span[2] if span else 1
 
     def get_error_context(self, p, token_index):
         """Retorna o contexto do erro para um token específico."""
-        if not hasattr(p.slice[token_index], "lexpos"):
+        span = self._line_span(p, token_index)
+        if span is None:
             return ""
-        pos = p.slice[token_index].lexpos
-        line_start = self.lexer.input_text.rfind("\n", 0, pos) + 1
-        line_end = self.lexer.input_text.find("\n", pos)
-
-        if line_end == -1:
-            line_end = len(self.lexer.input_text)
-        return self.lexer.input_text[line_start:line_end]
+        start, end, _ = span
+        return self.lexer.input_text[start:end]
 
     def format_error_pointer(self, p, token_index):
         """Cria o ponteiro visual para o erro."""
-        column = self.find_column(p, token_index)
-        return " " * (column - 1) + "^"
+        return " " * (self.find_column(p, token_index) - 1) + "^"
 
     def _get_recommendation(self, token_value, token_type, expected):
-        """Gera uma recomendação contextual baseada no contexto do erro."""
+        """Gera uma recomendação contextual baseada no contexto do erro (expected: frozenset dos tokens esperados)."""
         token_lower = str(token_value).lower() if token_value else ""
 
         # Verifica erros de digitação comuns em palavras-chave
@@ -795,13 +1050,13 @@ relation_operator_left relation_name relation_operator_right cardinality class_n
             return f"Did you mean '{correct}'?"
 
         # Verifica se parece um erro de digitação de um estereótipo válido
-        for stereotype in self.VALID_STEREOTYPES:
-            if _is_similar(token_lower, stereotype.lower()):
+        for stereotype, stereotype_lower in self._STEREOTYPE_BUCKETS.get(len(token_lower), _EMPTY):
+            if _is_similar(token_lower, stereotype_lower):
                 return f"Unknown stereotype '{token_value}'. Did you mean '{stereotype}'?"
 
         # Verifica se parece um erro de digitação de um estereótipo de relação válido
-        for rel_stereo in self.VALID_RELATION_STEREOTYPES:
-            if _is_similar(token_lower, rel_stereo.lower()):
+        for rel_stereo, rel_stereo_lower in self._RELATION_STEREOTYPE_BUCKETS.get(len(token_lower), _EMPTY):
+            if _is_similar(token_lower, rel_stereo_lower):
                 return f"Unknown relation stereotype '{token_value}'. Did you mean '{rel_stereo}'?"
 
         # Recomendações específicas de contexto baseadas nos tokens esperados
@@ -826,62 +1081,16 @@ relation_operator_left relation_name relation_operator_right cardinality class_n
             if "INSTANCE_NAME" in expected and token_type in ("CLASS_NAME", "RELATION_NAME", "IDENTIFIER"):
                 return f"Instance names must start with lowercase and end with numbers. Example: '{token_value.lower()}01'"
 
-            # Nome do pacote faltando
-            if ("IDENTIFIER" in expected or "CLASS_NAME" in expected) and token_type == "{":
-                return "Expected a name before '{'. Did you forget the identifier?"
-
-            # Chave de fechamento faltando
-            if "'}'" in expected:
-                return "Missing closing brace '}'. Check that all blocks are properly closed."
-
-            # Chave de abertura faltando
-            if "'{'" in expected:
-                return "Expected '{' to start a block body."
-
-            # Dois pontos faltando no atributo
-            if "':'" in expected and token_type in ("IDENTIFIER", "RELATION_NAME"):
-                return "Attribute declaration requires ':' between name and type. Example: 'name: String'"
-
-            # Palavra-chave specializes faltando
-            if "KEYWORD_SPECIALIZES" in expected:
-                return "Use 'specializes' keyword for inheritance. Example: 'subkind Child specializes Parent'"
-
-            # Cardinalidade faltando
-            if "'['" in expected:
-                return "Expected cardinality in brackets. Example: '[1..*]' or '[1]'"
-
-            # Operador de relação faltando
-            if "ASSOCIATION" in expected or "ASSOCIATIONL" in expected:
-                return "Expected relation operator: '--', '-->', '<--', '<-->', '<>--', '--<>', '<o>--', or '--<o>'"
-
-            # General/specifics faltando no genset
-            if "KEYWORD_GENERAL" in expected:
-                return "Genset body requires 'general' keyword. Example: 'general ParentClass'"
-
-            if "KEYWORD_SPECIFICS" in expected:
-                return "Genset body requires 'specifics' keyword. Example: 'specifics Child1, Child2'"
-
-            # Vírgula faltando
-            if "','" in expected and token_type in ("IDENTIFIER", "CLASS_NAME", "RELATION_NAME"):
-                return "Missing comma between items. Use ',' to separate multiple values."
-
-            # Class name esperado
-            if "CLASS_NAME" in expected:
-                return "Expected a class name (PascalCase, starting with uppercase). Example: 'Person', 'CarOwnership'"
-
-            # Relation name esperado
-            if "RELATION_NAME" in expected:
-                return "Expected a relation/attribute name (camelCase, starting with lowercase). Example: 'hasParent', 'name'"
-
-            # Identificador esperado
-            if "IDENTIFIER" in expected:
-                return "Expected an identifier (name) at this position."
+            # Demais casos: primeira entrada da tabela cujo gatilho está entre os esperados
+            for triggers, token_types, message in self._EXPECTED_HINTS:
+                if (token_types is None or token_type in token_types) and not expected.isdisjoint(triggers):
+                    return message
 
         # Recomendações específicas de tipo de token
         if token_type == "NUMBER" and "IDENTIFIER" in (expected or []):
             return "Identifiers cannot start with a number. Use a letter or underscore."
 
-        if token_value in self.VALID_STEREOTYPES and "IDENTIFIER" in (expected or []):
+        if token_value in self._STEREOTYPE_SET and "IDENTIFIER" in (expected or []):
             return f"'{token_value}' is a reserved keyword and cannot be used as an identifier."
 
         # Recomendações genéricas baseadas em padrões comuns
@@ -898,79 +1107,108 @@ relation_operator_left relation_name relation_operator_right cardinality class_n
         if not expected:
             return ""
 
-        # Agrupa tokens por categoria para saída mais limpa
-        keywords = []
-        stereotypes = []
-        operators = []
-        other = []
+        # Agrupa tokens por categoria para saída mais limpa: palavras-chave, estereótipos, operadores, outros
+        groups = ([], [], [], [])
 
         for tok in expected:
-            if tok.startswith("KEYWORD_"):
+            label = _EXPECTED_LABELS.get(tok)
+            if label is not None:
+                groups[label[0]].append(label[1])
+            elif tok.startswith("KEYWORD_"):
                 # Converte KEYWORD_PACKAGE para 'package'
-                keywords.append(tok.replace("KEYWORD_", "").lower())
-            elif tok.startswith("CLASS_") and tok != "CLASS_NAME":
-                # Class stereotypes like CLASS_KIND
-                stereotypes.append(tok.replace("CLASS_", "").lower())
-            elif tok.startswith("RELATION_") and tok != "RELATION_NAME":
-                # Relation stereotypes like RELATION_MEDIATION
-                stereotypes.append(tok.replace("RELATION_", "").lower())
-            elif tok in ("ASSOCIATION", "ASSOCIATIONL", "ASSOCIATIONR", "ASSOCIATIONLR"):
-                operators.append("--/-->/etc.")
-            elif tok in ("AGGREGATIONL", "AGGREGATIONR"):
-                operators.append("<>--/--<>")
-            elif tok in ("COMPOSITIONL", "COMPOSITIONR"):
-                operators.append("<o>--/--<o>")
-            elif tok == "CLASS_NAME":
-                other.append("ClassName (PascalCase)")
-            elif tok == "RELATION_NAME":
-                other.append("relationName (camelCase)")
-            elif tok == "INSTANCE_NAME":
-                other.append("instanceName01 (with number)")
-            elif tok == "IDENTIFIER":
-                other.append("identifier")
-            elif tok == "NUMBER":
-                other.append("number")
+                groups[0].append(tok.replace("KEYWORD_", "").lower())
             elif len(tok) <= 3:  # Provavelmente pontuação como '{', '}', ':'
-                other.append(f"'{tok}'")
+                groups[3].append(f"'{tok}'")
             else:
-                other.append(tok.lower())
+                groups[3].append(tok.lower())
 
-        # Remove duplicatas preservando a ordem
-        all_tokens = []
-        seen = set()
-        for token_list in [keywords, stereotypes, list(set(operators)), other]:
-            for t in token_list:
-                if t not in seen:
-                    all_tokens.append(t)
-                    seen.add(t)
+        # Remove duplicatas preservando a ordem dos grupos (dict como conjunto ordenado)
+        all_tokens = list(dict.fromkeys(label for group in groups for label in group))
 
         if len(all_tokens) > 5:
             return ", ".join(all_tokens[:5]) + f", ... ({len(all_tokens)} options)"
         return ", ".join(all_tokens)
 
+    def _expected_tokens(self, state):
+        """
+        Retorna (tokens aceitos no estado LALR sem '$end'/'error', os mesmos como frozenset, texto formatado).
+
+        Os três dependem apenas do estado, então são calculados uma vez por estado e reaproveitados
+        por todos os erros seguintes no mesmo ponto da gramática.
+        """
+        cached = self._expected_cache.get(state)
+        if cached is None:
+            expected = ()
+            if hasattr(self.parser, "action") and state in self.parser.action:
+                # Filtrar tokens especiais (tupla: compartilhada entre todos os erros do mesmo estado)
+                expected = tuple(tok for tok in self.parser.action[state] if tok not in ("$end", "error"))
+            cached = self._expected_cache[state] = (expected, frozenset(expected), self._format_expected_tokens(expected))
+        return cached
+
+    def _stop_parsing(self, tok):
+        """
+        Interrompe a análise ao atingir max_errors: registra (uma única vez) um erro indicando que a lista foi
+        cortada, na posição do token atual, e leva o lexer ao fim da entrada para que a análise termine no
+        próximo token. Erros léxicos do restante da entrada também deixam de ser registrados.
+        """
+        if not self._stopped:
+            self._stopped = True
+            if tok:
+                line_start, line_end, column = self._span_at(tok.lexpos)
+                token, token_type, line = tok.value, tok.type, tok.lineno
+            else:  # Limite atingido no fim do arquivo
+                line_start = line_end = column = 0
+                token = token_type = line = "EOF"
+            self.errors.append(
+                {
+                    "type": "SyntaxError",
+                    "token": token,
+                    "token_type": token_type,
+                    "line": line,
+                    "column": column,
+                    "line_text": self.lexer.input_text[line_start:line_end] if self.error_details else "",
+                    "pointer": " " * (column - 1) + "^" if self.error_details and column else "",
+                    "filename": self.filename or "<unknown>",
+                    "message": f"Too many syntax errors (max_errors={self.max_errors}); parsing stopped",
+                    "expected": _EMPTY,
+                    "recommendation": "Fix the errors above and parse again to see the remaining ones." if self.error_details else "",
+                }
+            )
+        self.lexer.lexer.lexpos = self.lexer.lexer.lexlen  # A análise termina no próximo token
+
+    def _record_error(self, tok, error_info):
+        """
+        Registra um erro de sintaxe (de p_error ou de uma regra) respeitando max_errors: com o limite já
+        atingido o erro é descartado e a análise é interrompida na posição de tok (ver _stop_parsing).
+        """
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            self._stop_parsing(tok)
+        else:
+            self.errors.append(error_info)
+
     def p_error(self, p):
         """Trata erros de sintaxe durante a análise."""
+        if self._stopped:  # Limite já atingido: nada mais a registrar nem formatar
+            self._stop_parsing(p)
+            return
+
         if p:
             # Obter tokens esperados
-            state = self.parser.state
-            expected = []
-
-            if hasattr(self.parser, "action") and state in self.parser.action:
-                expected = list(self.parser.action[state].keys())
-                # Filtrar tokens especiais
-                expected = [tok for tok in expected if tok not in ("$end", "error")]
+            expected, expected_set, expected_str = self._expected_tokens(self.parser.state)
 
-            # Construir mensagem de erro
-            column = self.lexer.find_column(p)
-            line_text = self.lexer.get_error_context(p)
-            pointer = self.lexer.format_error_pointer(p)
+            # Construir mensagem de erro (linha e coluna resolvidas uma única vez para os três campos)
+            line_start, line_end, column = self._span_at(p.lexpos)
+            if self.error_details:
+                line_text = self.lexer.input_text[line_start:line_end]
+                pointer = " " * (column - 1) + "^"
 
-            # Obter recomendação contextual
-            recommendation = self._get_recommendation(p.value, p.type, expected)
+                # Obter recomendação contextual
+                recommendation = self._get_recommendation(p.value, p.type, expected_set)
+            else:
+                line_text = pointer = recommendation = ""  # Erros só contados: contexto não é formatado
 
             error_message = f"Unexpected token '{p.value}' (type: {p.type})"
             if expected:
-                expected_str = self._format_expected_tokens(expected)
                 error_message += f". Expected: {expected_str}"
 
             error_info = {
@@ -987,20 +1225,7 @@ relation_operator_left relation_name relation_operator_right cardinality class_n
                 "recommendation": recommendation,
             }
 
-            self.errors.append(error_info)
+            self._record_error(p, error_info)
         else:
-            # Erro no final do arquivo
-            error_info = {
-                "type": "SyntaxError",
-                "token": "EOF",
-                "token_type": "EOF",
-                "line": "EOF",
-                "column": 0,
-                "line_text": "",
-                "pointer": "",
-                "filename": self.filename or "<unknown>",
-                "message": "Unexpected end of file. Check for unclosed braces or incomplete statements.",
-                "expected": [],
-                "recommendation": "Ensure all '{' have matching '}' and all statements are complete.",
-            }
-            self.errors.append(error_info)
+            # Erro no final do arquivo (cópia do modelo fixo; a chave já existe, então a ordem se mantém)
+            self._record_error(p, {**_EOF_ERROR, "filename": self.filename or "<unknown>"})
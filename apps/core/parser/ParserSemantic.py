@@ -30,6 +30,7 @@ class SymbolTable:
         self.datatypes = {}         # dict -> definição de datatype
         self.enums = {}             # dict -> definição de enum
         self.primitives = {}        # dict -> definição de tipos primitivos
+        self._indexes = None        # dict -> índices reversos (pai -> filhos, classe -> relações...), montados na 1ª consulta
 
         # Popular a tabela de símbolos com tipos primitivos
         self._init_primitives()
@@ -53,6 +54,7 @@ class SymbolTable:
         name = class_def.get('class_name')
         if name:
             self.classes[name] = class_def
+            self._indexes = None
 
     def add_relation(self, relation_def: dict, source_class: str = None) -> None:
         '''
@@ -68,6 +70,7 @@ class SymbolTable:
             relation_def['source_class'] = source_class
         
         self.relations.append(relation_def)
+        self._indexes = None
 
     def add_genset(self, genset_def: dict) -> None:
         '''
@@ -80,6 +83,7 @@ class SymbolTable:
         name = genset_def.get('genset_name')
         if name:
             self.gensets[name] = genset_def
+            self._indexes = None
 
     def add_datatype(self, datatype_def: dict) -> None:
         '''
@@ -92,6 +96,7 @@ class SymbolTable:
         name = datatype_def.get('datatype_name')
         if name:
             self.datatypes[name] = datatype_def
+            self._indexes = None
 
     def add_enum(self, enum_def: dict) -> None:
         '''
@@ -104,6 +109,7 @@ class SymbolTable:
         name = enum_def.get('enum_name')
         if name:
             self.enums[name] = enum_def
+            self._indexes = None
 
     #==================================
 
@@ -120,19 +126,70 @@ class SymbolTable:
         return self.enums.get(enum_name)
     
     def resolve_type(self, type_name: str) -> dict | None:
-        return (
-            self.primitives.get(type_name) or
-            self.classes.get(type_name) or
-            self.datatypes.get(type_name) or
-            self.enums.get(type_name)
-        )
+        # Um único dict com todos os tipos (ver _get_indexes): uma busca em vez de quatro
+        return self._get_indexes()['types'].get(type_name)
 
     def class_exists(self, class_name: str) -> bool:
         return class_name in self.classes
 
     def datatype_exists(self, datatype_name: str) -> bool:
-        return self.resolve_type(datatype_name) is not None
+        return datatype_name in self._get_indexes()['types']
     
+    #==================================
+
+    def _get_indexes(self) -> dict:
+        '''
+        Retorna os índices reversos usados pelas consultas abaixo, montados numa única passada.
+
+        A detecção de padrões consulta filhos, gensets, relações e tipos de atributo de cada classe; com os índices cada
+        consulta é um acesso a dict em vez de varrer todas as classes/relações. Os índices são
+        descartados a cada add_* e remontados na próxima consulta, mantendo a ordem de inserção.
+
+        Returns:
+            dict: nome do índice -> dict de chave -> lista de definições
+        '''
+        if self._indexes is not None:
+            return self._indexes
+
+        classes_by_stereotype = {}
+        children_by_parent = {}
+        for class_def in self.classes.values():
+            classes_by_stereotype.setdefault(class_def.get('class_stereotype'), []).append(class_def)
+            specialization = class_def.get('specialization')
+            if specialization:
+                for parent in dict.fromkeys(specialization.get('parents', [])):
+                    children_by_parent.setdefault(parent, []).append(class_def)
+
+        gensets_by_general = {}
+        gensets_by_specific = {}
+        for genset_def in self.gensets.values():
+            gensets_by_general.setdefault(genset_def.get('general'), []).append(genset_def)
+            for specific in dict.fromkeys(genset_def.get('specifics', [])):
+                gensets_by_specific.setdefault(specific, []).append(genset_def)
+
+        relations_by_class = {}
+        internal_relations_by_class = {}
+        relations_by_stereotype = {}
+        for rel in self.relations:
+            for class_name in {rel.get('source_class'), rel.get('first_end'), rel.get('second_end')}:
+                relations_by_class.setdefault(class_name, []).append(rel)
+            if rel.get('node_type') == 'internal_relation':
+                internal_relations_by_class.setdefault(rel.get('source_class'), []).append(rel)
+            relations_by_stereotype.setdefault(rel.get('relation_stereotype'), []).append(rel)
+
+        self._indexes = {
+            # Mesma precedência da busca em sequência: primitivos > classes > datatypes > enums
+            'types': {**self.enums, **self.datatypes, **self.classes, **self.primitives},
+            'classes_by_stereotype': classes_by_stereotype,
+            'children_by_parent': children_by_parent,
+            'gensets_by_general': gensets_by_general,
+            'gensets_by_specific': gensets_by_specific,
+            'relations_by_class': relations_by_class,
+            'internal_relations_by_class': internal_relations_by_class,
+            'relations_by_stereotype': relations_by_stereotype,
+        }
+        return self._indexes
+
     #==================================
     '''
     Para detecção de padrão, é necessário:
@@ -155,10 +212,7 @@ class SymbolTable:
         Returns:
             list[dict]: lista de dicionários de definições de classes com o estereótipo especificado
         '''
-        return [
-            class_def for class_def in self.classes.values()
-            if class_def.get('class_stereotype') == stereotype
-        ]
+        return list(self._get_indexes()['classes_by_stereotype'].get(stereotype, ()))
 
     def get_children_of(self, class_name: str, stereotype: str = None) -> list[dict]:
         '''
@@ -171,15 +225,10 @@ class SymbolTable:
         Returns:
             list[dict]: lista de dicionários de definições de classes que se especializam na classe especificada
         '''
-        children = []
-        for class_def in self.classes.values():
-            specialization = class_def.get('specialization')
-            if specialization:
-                parents = specialization.get('parents', [])
-                if class_name in parents:
-                    if stereotype is None or class_def.get('class_stereotype') == stereotype:
-                        children.append(class_def)
-        return children
+        children = self._get_indexes()['children_by_parent'].get(class_name, ())
+        if stereotype is None:
+            return list(children)
+        return [class_def for class_def in children if class_def.get('class_stereotype') == stereotype]
 
     def get_parents_of(self, class_name: str) -> list[dict]:
         '''
@@ -206,10 +255,7 @@ class SymbolTable:
         Returns:
             list[dict]: lista de dicionários de definições de gensets onde a classe especificada é a geral
         '''
-        return [
-            genset_def for genset_def in self.gensets.values()
-            if genset_def.get('general') == class_name
-        ]
+        return list(self._get_indexes()['gensets_by_general'].get(class_name, ()))
 
     def get_genset_for_specific(self, class_name: str) -> list[dict]:
         '''
@@ -221,10 +267,7 @@ class SymbolTable:
         Returns:
             list[dict]: lista de dicionários de definições de gensets onde a classe especificada é uma específica
         '''
-        return [
-            genset_def for genset_def in self.gensets.values()
-            if class_name in genset_def.get('specifics', [])
-        ]
+        return list(self._get_indexes()['gensets_by_specific'].get(class_name, ()))
 
     def get_relations_for_class(self, class_name: str) -> list[dict]:
         '''
@@ -236,13 +279,7 @@ class SymbolTable:
         Returns:
             list[dict]: lista de dicionários de definições de relações envolvendo a classe especificada
         '''
-        result = []
-        for rel in self.relations:
-            if (rel.get('source_class') == class_name or
-                rel.get('first_end') == class_name or
-                rel.get('second_end') == class_name):
-                result.append(rel)
-        return result
+        return list(self._get_indexes()['relations_by_class'].get(class_name, ()))
 
     def get_internal_relations_of(self, class_name: str) -> list[dict]:
         '''
@@ -254,11 +291,7 @@ class SymbolTable:
         Returns:
             list[dict]: lista de dicionários de definições de relações internas envolvendo a classe especificada
         '''
-        return [
-            rel for rel in self.relations
-            if rel.get('node_type') == 'internal_relation' and
-            rel.get('source_class') == class_name
-        ]
+        return list(self._get_indexes()['internal_relations_by_class'].get(class_name, ()))
     
     def get_relations_by_stereotype(self, stereotype: str) -> list[dict]:
         '''
@@ -270,10 +303,7 @@ class SymbolTable:
         Returns:
             list[dict]: lista de dicionários de definições de relações com o estereótipo especificado
         '''
-        return [
-            rel for rel in self.relations
-            if rel.get('relation_stereotype') == stereotype
-        ]
+        return list(self._get_indexes()['relations_by_stereotype'].get(stereotype, ()))
 
     #==================================
 
@@ -312,29 +342,30 @@ class SymbolTable:
         '''
         content = ast.get('content', [])
 
+        # Um add_* por tipo de definição (métodos resolvidos uma vez, fora do laço)
+        add_relation = self.add_relation
+        add_by_node_type = {
+            'class_definition': self.add_class,
+            'datatype_definition': self.add_datatype,
+            'enum_definition': self.add_enum,
+            'genset_definition': self.add_genset,
+            'external_relation': add_relation,
+        }
+
         for definition in content:
             node_type = definition.get('node_type')
+            add = add_by_node_type.get(node_type)
+            if add is None:
+                continue
+            add(definition)
 
             if node_type == 'class_definition':
-                self.add_class(definition)
-
+                # Relações internas do corpo da classe
                 class_name = definition.get('class_name')
                 body = definition.get('body') or []
                 for item in body:
                     if item.get('node_type') == 'internal_relation':
-                        self.add_relation(item, source_class=class_name)
-
-            elif node_type == 'datatype_definition':
-                self.add_datatype(definition)
-
-            elif node_type == 'enum_definition':
-                self.add_enum(definition)
-
-            elif node_type == 'genset_definition':
-                self.add_genset(definition)
-
-            elif node_type == 'external_relation':
-                self.add_relation(definition)
+                        add_relation(item, source_class=class_name)
 
 #==================================
 
@@ -18,14 +18,34 @@ import sys
 # Handle both relative imports (package) and absolute imports (direct script)
 try:
     from lexer.Utils import (
-        Colors, BOX_STYLES, strip_ansi_codes, print_progress_bar
+        Colors, BOX_STYLES, strip_ansi_codes, print_progress_bar, truncate_text
     )
 except ImportError:
     from ..lexer.Utils import (
-        Colors, BOX_STYLES, strip_ansi_codes, print_progress_bar
+        Colors, BOX_STYLES, strip_ansi_codes, print_progress_bar, truncate_text
     )
 
 
+# Régua abaixo dos títulos de seção de padrões
+_SECTION_RULE = "─" * 20
+
+# Rótulos pré-formatados por severidade das violações
+_SEV_LABEL = {
+    "error": "[ERROR]",
+    "warning": "[WARNING]",
+    "info": "[INFO]",
+    "hint": "[HINT]",
+}
+
+# Rótulos dos modificadores de genset indexados por (disjoint, complete)
+_MODIFIERS_LABEL = {
+    (False, False): "(no modifiers)",
+    (True, False): "disjoint",
+    (False, True): "complete",
+    (True, True): "disjoint complete",
+}
+
+
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
@@ -88,20 +108,34 @@ def format_cardinality(card):
     return f'[{card}]'
 
 
-def truncate_text(text, max_len=60):
+def format_severity(violation):
     """
-    Trunca texto adicionando '...' se exceder o tamanho máximo.
+    Retorna o rótulo de severidade de uma violação.
     
     Args:
-        text: Texto a truncar
-        max_len: Tamanho máximo permitido
+        violation: Dict da violação (chave 'severity', padrão 'warning')
     
     Returns:
-        str: Texto truncado ou original se menor que max_len
+        str: Rótulo como '[WARNING]'
     """
-    if len(text) <= max_len:
-        return text
-    return text[:max_len - 3] + "..."
+    severity = violation.get('severity', 'warning')
+    label = _SEV_LABEL.get(severity)
+    if label is None:
+        label = f"[{severity.upper()}]"
+    return label
+
+
+def format_modifiers(genset):
+    """
+    Retorna o rótulo dos modificadores de um genset.
+    
+    Args:
+        genset: Dict com as chaves opcionais 'disjoint' e 'complete'
+    
+    Returns:
+        str: 'disjoint', 'complete', 'disjoint complete' ou '(no modifiers)'
+    """
+    return _MODIFIERS_LABEL[(bool(genset.get('disjoint')), bool(genset.get('complete')))]
 
 
 # ============================================
@@ -125,7 +159,8 @@ def _render_box(title, content_lines):
     
     # Calcular largura necessária
     title_length = len(strip_ansi_codes(title))
-    max_content_length = max(len(strip_ansi_codes(line)) for line in content_lines) if content_lines else 0
+    line_lengths = [len(strip_ansi_codes(line)) for line in content_lines]
+    max_content_length = max(line_lengths, default=0)
     content_width = max(title_length, max_content_length) + 4
     
     # Construir linhas da caixa
@@ -140,8 +175,7 @@ def _render_box(title, content_lines):
     print(title_line)
     print(separator)
     
-    for line in content_lines:
-        line_length = len(strip_ansi_codes(line))
+    for line, line_length in zip(content_lines, line_lengths):
         spaces_needed = content_width - line_length - 4
         padded_line = box["v"] + "  " + line + " " * spaces_needed + "  " + box["v"]
         print(padded_line)
@@ -154,13 +188,15 @@ def _render_box(title, content_lines):
 # SECTION BUILDERS - SUMMARY STATISTICS
 # ============================================
 
-def _build_file_summary(filepath, result):
+def _build_file_summary(filepath, result, lexer_errors, parser_errors):
     """
     Constrói seção de resumo do arquivo.
     
     Args:
         filepath: Caminho do arquivo analisado
-        result: Dict completo do resultado (inclui lexer_errors, parser_errors)
+        result: Dict completo do resultado
+        lexer_errors: Lista de erros léxicos
+        parser_errors: Lista de erros sintáticos
     
     Returns:
         list: Lista de linhas formatadas
@@ -171,11 +207,9 @@ def _build_file_summary(filepath, result):
     lines.append(f"{Colors.BOLD}File:{Colors.RESET} {filepath}")
     
     # Erros léxicos
-    lexer_errors = result.get("lexer_errors", [])
     lines.append(f"{Colors.BOLD}Lexical Errors:{Colors.RESET} {format_status_icon(len(lexer_errors))}")
     
     # Erros sintáticos
-    parser_errors = result.get("parser_errors", [])
     lines.append(f"{Colors.BOLD}Syntax Errors:{Colors.RESET} {format_status_icon(len(parser_errors))}")
     
     # Warnings semânticos (baseado em patterns incompletos)
@@ -253,11 +287,10 @@ def _build_class_stereotypes(symbols):
     
     lines.append(f"{Colors.BOLD}{Colors.BLUE}CLASS STEREOTYPES{Colors.RESET}")
     
-    # Ordenar alfabeticamente
-    sorted_stereos = sorted(stereo_counts.items())
-    max_name_len = max(len(f"@{name}") for name, _ in sorted_stereos)
+    # Ordem de primeira ocorrência no modelo (dicts preservam a ordem de inserção)
+    max_name_len = max(len(name) for name in stereo_counts) + 1
     
-    for stereo, count in sorted_stereos:
+    for stereo, count in stereo_counts.items():
         percentage = (count / total) * 100
         bar = print_progress_bar(percentage, count, total)
         lines.append(f"{Colors.MAGENTA}@{stereo:<{max_name_len - 1}}{Colors.RESET}  {bar}")
@@ -295,11 +328,10 @@ def _build_relation_stereotypes(symbols):
     
     lines.append(f"{Colors.BOLD}{Colors.BLUE}RELATION STEREOTYPES{Colors.RESET}")
     
-    # Ordenar alfabeticamente
-    sorted_stereos = sorted(stereo_counts.items())
-    max_name_len = max(len(f"@{name}") for name, _ in sorted_stereos)
+    # Ordem de primeira ocorrência no modelo (dicts preservam a ordem de inserção)
+    max_name_len = max(len(name) for name in stereo_counts) + 1
     
-    for stereo, count in sorted_stereos:
+    for stereo, count in stereo_counts.items():
         percentage = (count / total) * 100
         bar = print_progress_bar(percentage, count, total)
         lines.append(f"{Colors.CYAN}@{stereo:<{max_name_len - 1}}{Colors.RESET}  {bar}")
@@ -377,7 +409,7 @@ def _build_complete_patterns(patterns):
         return lines
     
     lines.append(f"{Colors.BOLD}{Colors.GREEN}COMPLETE PATTERNS{Colors.RESET}")
-    lines.append("─" * 20)
+    lines.append(_SECTION_RULE)
     
     for pattern in patterns:
         pattern_lines = _format_pattern(pattern, is_complete=True)
@@ -403,7 +435,7 @@ def _build_incomplete_patterns(patterns):
         return lines
     
     lines.append(f"{Colors.BOLD}{Colors.YELLOW}INCOMPLETE PATTERNS{Colors.RESET}")
-    lines.append("─" * 20)
+    lines.append(_SECTION_RULE)
     
     for pattern in patterns:
         pattern_lines = _format_pattern(pattern, is_complete=False)
@@ -443,18 +475,9 @@ def _format_pattern(pattern, is_complete=True):
     lines.append(f"  Anchor: {anchor} (@{stereotype})")
     
     # Formatação específica por tipo de padrão
-    if pattern_type == "Subkind_Pattern":
-        lines.extend(_format_subkind_pattern(elements, constraints))
-    elif pattern_type == "Role_Pattern":
-        lines.extend(_format_role_pattern(elements, constraints))
-    elif pattern_type == "Phase_Pattern":
-        lines.extend(_format_phase_pattern(elements, constraints))
-    elif pattern_type == "Relator_Pattern":
-        lines.extend(_format_relator_pattern(elements, constraints))
-    elif pattern_type == "Mode_Pattern":
-        lines.extend(_format_mode_pattern(elements, constraints))
-    elif pattern_type == "RoleMixin_Pattern":
-        lines.extend(_format_rolemixin_pattern(elements, constraints))
+    formatter = _PATTERN_FORMATTERS.get(pattern_type)
+    if formatter is not None:
+        lines.extend(formatter(elements, constraints))
     
     # Violations e suggestions para padrões incompletos
     if not is_complete:
@@ -464,9 +487,7 @@ def _format_pattern(pattern, is_complete=True):
         if violations:
             lines.append(f"  {Colors.YELLOW}Violations:{Colors.RESET}")
             for v in violations:
-                severity = v.get('severity', 'warning').upper()
-                message = v.get('message', '')
-                lines.append(f"    - [{severity}] {message}")
+                lines.append(f"    - {format_severity(v)} {v.get('message', '')}")
         
         if suggestions:
             lines.append(f"  {Colors.CYAN}Suggestions:{Colors.RESET}")
@@ -498,9 +519,7 @@ def _format_subkind_pattern(elements, constraints):
         lines.append(f"  Subkinds: {', '.join(specifics)}")
     
     if genset_name:
-        disjoint = "disjoint" if constraints.get('disjoint') else ""
-        complete = "complete" if constraints.get('complete') else ""
-        modifiers = ' '.join(filter(None, [disjoint, complete])) or "(no modifiers)"
+        modifiers = format_modifiers(constraints)
         lines.append(f"  Genset: {genset_name} [{modifiers}]")
         
         if constraints.get('disjoint_implicit'):
@@ -526,9 +545,7 @@ def _format_role_pattern(elements, constraints):
         lines.append(f"  Roles: {', '.join(specifics)}")
     
     if genset_name:
-        disjoint = "disjoint" if constraints.get('disjoint') else ""
-        complete = "complete" if constraints.get('complete') else ""
-        modifiers = ' '.join(filter(None, [disjoint, complete])) or "(no modifiers)"
+        modifiers = format_modifiers(constraints)
         lines.append(f"  Genset: {genset_name} [{modifiers}]")
     else:
         lines.append(f"  Genset: (none)")
@@ -567,9 +584,7 @@ def _format_phase_pattern(elements, constraints):
         lines.append(f"  Phases: {', '.join(specifics)}")
     
     if genset_name:
-        disjoint = "disjoint" if constraints.get('disjoint') else ""
-        complete = "complete" if constraints.get('complete') else ""
-        modifiers = ' '.join(filter(None, [disjoint, complete])) or "(no modifiers)"
+        modifiers = format_modifiers(constraints)
         lines.append(f"  Genset: {genset_name} [{modifiers}]")
         
         if constraints.get('disjoint_implicit'):
@@ -658,9 +673,7 @@ def _format_rolemixin_pattern(elements, constraints):
         lines.append("  Gensets:")
         for g in gensets:
             genset_name = g.get('name', '(anonymous)')
-            disjoint = "disjoint" if g.get('disjoint') else ""
-            complete = "complete" if g.get('complete') else ""
-            modifiers = ' '.join(filter(None, [disjoint, complete])) or "(no modifiers)"
+            modifiers = format_modifiers(g)
             specifics = g.get('specifics', [])
             lines.append(f"    - {genset_name} [{modifiers}]")
             if specifics:
@@ -669,11 +682,22 @@ def _format_rolemixin_pattern(elements, constraints):
     return lines
 
 
+# Formatador específico de cada tipo de padrão (tipos desconhecidos mostram apenas o cabeçalho)
+_PATTERN_FORMATTERS = {
+    "Subkind_Pattern": _format_subkind_pattern,
+    "Role_Pattern": _format_role_pattern,
+    "Phase_Pattern": _format_phase_pattern,
+    "Relator_Pattern": _format_relator_pattern,
+    "Mode_Pattern": _format_mode_pattern,
+    "RoleMixin_Pattern": _format_rolemixin_pattern,
+}
+
+
 # ============================================
 # MAIN ENTRY POINT
 # ============================================
 
-def print_semantic_report(result, filepath, verbose=False):
+def print_semantic_report(result, filepath, lexer_errors=None, parser_errors=None, verbose=False):
     """
     Função principal para imprimir o relatório visual da análise semântica.
     
@@ -682,24 +706,29 @@ def print_semantic_report(result, filepath, verbose=False):
             Chaves esperadas:
             - summary: {total_patterns, complete_patterns, incomplete_patterns, pattern_counts}
             - files: [{symbols, patterns, incomplete_patterns}]
-            - lexer_errors: list (adicionado por main_semantic.py)
-            - parser_errors: list (adicionado por main_semantic.py)
         filepath: Caminho do arquivo analisado
+        lexer_errors: Lista de erros léxicos (se None, usa result["lexer_errors"] quando presente)
+        parser_errors: Lista de erros sintáticos (se None, usa result["parser_errors"] quando presente)
         verbose: Se True, mostra detalhes completos dos padrões
     
     Examples:
         >>> print_semantic_report(result, "example.tonto", verbose=False)
         # Mostra resumo com warnings truncados
         
-        >>> print_semantic_report(result, "example.tonto", verbose=True)
+        >>> print_semantic_report(result, "example.tonto", lexer.errors, parser.errors, verbose=True)
         # Mostra todos os padrões com detalhes completos
     """
     Colors.initialize()
     
+    if lexer_errors is None:
+        lexer_errors = result.get("lexer_errors", [])
+    if parser_errors is None:
+        parser_errors = result.get("parser_errors", [])
+    
     content_lines = []
     
     # Seção 1: Resumo do arquivo
-    content_lines.extend(_build_file_summary(filepath, result))
+    content_lines.extend(_build_file_summary(filepath, result, lexer_errors, parser_errors))
     content_lines.append("")
     
     # Seção 2: Padrões detectados
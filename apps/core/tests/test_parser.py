@@ -0,0 +1,248 @@
+import pytest
+
+from lexer.MyLexer import MyLexer
+from parser.MyParser import MyParser
+
+CODE = """package Cache
+
+kind Person
+subkind Adult specializes Person
+"""
+
+
+@pytest.fixture
+def lexer():
+    lexer = MyLexer()
+    lexer.build()
+    return lexer
+
+
+@pytest.fixture
+def empty_parser_cache(monkeypatch):
+    monkeypatch.setattr(MyParser, "_parser_cache", {})
+
+
+class TestParserCache:
+    """Tests for the pickled LR table cache."""
+
+    def test_cache_roundtrip(self, lexer, tmp_path, empty_parser_cache):
+        """A parser loaded from the cache should produce the same AST as a freshly built one."""
+        cache_path = tmp_path / "parsetab.pickle"
+
+        fresh = MyParser(lexer)
+        fresh.build(cache_path=str(cache_path), debug=False, write_tables=False)
+        assert len(list(tmp_path.glob("parsetab-*.pickle"))) == 1
+
+        cached = MyParser(lexer)
+        cached.build(cache_path=str(cache_path), debug=False, write_tables=False)
+
+        assert cached.parse(CODE) == fresh.parse(CODE)
+
+    def test_cache_binds_to_instance(self, lexer, tmp_path, empty_parser_cache):
+        """Errors from a cached parser should be recorded on the instance that loaded it."""
+        cache_path = str(tmp_path / "parsetab.pickle")
+        MyParser(lexer).build(cache_path=cache_path, debug=False, write_tables=False)
+
+        cached = MyParser(lexer)
+        cached.build(cache_path=cache_path, debug=False, write_tables=False)
+        cached.parse("package Broken\nkind Person {\n  name\n}\n")
+
+        assert cached.errors
+
+    def test_shared_tables_keep_instances_independent(self, lexer, empty_parser_cache):
+        """Parsers cloned from the class-level cache should not steal each other's callbacks."""
+        first = MyParser(lexer)
+        first.build(debug=False, write_tables=False)
+        second = MyParser(lexer)
+        second.build(debug=False, write_tables=False)
+
+        assert first.parser.action is second.parser.action
+        first.parse("package Broken\nkind Person {\n  name\n}\n")
+
+        assert first.errors
+        assert not second.errors
+
+    def test_new_cache_replaces_stale_ones(self, lexer, tmp_path, empty_parser_cache):
+        """Writing the cache for the current grammar should delete files left by previous grammars."""
+        stale = tmp_path / "parsetab-0123456789abcdef.pickle"
+        stale.write_bytes(b"old tables")
+        unrelated = tmp_path / "parsetab-notes.pickle"
+        unrelated.write_bytes(b"keep")
+
+        MyParser(lexer).build(cache_path=str(tmp_path / "parsetab.pickle"))
+
+        assert not stale.exists()
+        assert unrelated.exists()
+        assert [f.name for f in tmp_path.glob("parsetab-*.pickle") if f != unrelated] == [f"parsetab-{MyParser.grammar_digest()[:16]}.pickle"]
+
+    def test_debug_build_regenerates_tables(self, lexer, tmp_path, monkeypatch, empty_parser_cache):
+        """build(debug=True) should run yacc (and write parser.out) even when the tables are already cached."""
+        cache_path = str(tmp_path / "parsetab.pickle")
+        MyParser(lexer).build(cache_path=cache_path)
+        assert len(list(tmp_path.glob("parsetab-*.pickle"))) == 1
+
+        generate = MyParser._generate_parser
+        calls = []
+
+        def generate_into_tmp(self, **kwargs):
+            calls.append(kwargs)
+            return generate(self, outputdir=str(tmp_path), **kwargs)
+
+        monkeypatch.setattr(MyParser, "_generate_parser", generate_into_tmp)
+        debug = MyParser(lexer)
+        debug.build(cache_path=cache_path, debug=True)
+
+        assert calls == [{"debug": True}]
+        assert (tmp_path / "parser.out").exists()
+        assert debug.parse(CODE)["package"]["package_name"] == "Cache"
+
+
+class TestErrorDetails:
+    """Tests for the error_details switch."""
+
+    BROKEN = "package Broken\nkind Person {\n  name\n}\n"
+
+    def test_errors_without_details_keep_position(self, lexer):
+        """Without details errors should keep their position but skip context formatting."""
+        detailed = MyParser(lexer)
+        detailed.build(debug=False, write_tables=False)
+        detailed.parse(self.BROKEN)
+
+        bare = MyParser(lexer, error_details=False)
+        bare.build(debug=False, write_tables=False)
+        bare.parse(self.BROKEN)
+
+        assert [(e["line"], e["column"], e["token"]) for e in bare.errors] == [(e["line"], e["column"], e["token"]) for e in detailed.errors]
+        assert all(e["line_text"] == e["pointer"] == e["recommendation"] == "" for e in bare.errors)
+
+    def test_parsing_stops_at_max_errors(self, lexer):
+        """Once max_errors errors are recorded the rest of the input should be skipped."""
+        parser = MyParser(lexer, max_errors=2)
+        parser.build(debug=False, write_tables=False)
+        parser.parse("package Broken\nkind Person { name }\n" * 10)  # one error per 'package' block
+
+        assert len(parser.errors) == 3
+
+    def test_stopped_parsing_is_recorded(self, lexer):
+        """Hitting max_errors should append one final error saying where parsing was cut short."""
+        parser = MyParser(lexer, max_errors=2)
+        parser.build(debug=False, write_tables=False)
+        parser.parse("package Broken\nkind Person { name }\n" * 10)
+
+        *errors, stopped = parser.errors
+        assert len(errors) == 2
+        assert stopped["message"] == "Too many syntax errors (max_errors=2); parsing stopped"
+        assert (stopped["line"], stopped["column"]) == (6, 20)
+        assert stopped["pointer"] == " " * 19 + "^"
+
+
+class TestGrammarShape:
+    """Tests for the grammar checks run after table generation."""
+
+    def test_grammar_has_no_right_recursion(self, lexer, recwarn):
+        """The shipped grammar should only use left-recursive list rules."""
+        MyParser(lexer).build(debug=False, write_tables=False)
+        assert not [w for w in recwarn if "Right-recursive" in str(w.message)]
+
+    def test_right_recursion_is_reported(self, lexer):
+        """A list rule written as `X : item ',' X` should trigger a warning."""
+
+        class RightRecursiveParser(MyParser):
+            def p_class_name_list(self, p):
+                """class_name_list : class_name
+                | class_name ',' class_name_list"""
+                p[0] = [p[1]] if len(p) == 2 else [p[1]] + p[3]
+
+        with pytest.warns(UserWarning, match="p_class_name_list"):
+            RightRecursiveParser(lexer).build(cache_path=None)
+
+
+class TestGensetModifiers:
+    """Tests for genset modifier parsing."""
+
+    GENSET = "package P\nkind A\nsubkind B specializes A\n{modifiers} genset G where B specializes A\n"
+
+    @pytest.fixture
+    def parser(self, lexer):
+        parser = MyParser(lexer)
+        parser.build(debug=False, write_tables=False)
+        return parser
+
+    @pytest.mark.parametrize("modifiers", ["disjoint complete", "complete disjoint"])
+    def test_modifier_order_is_irrelevant(self, parser, modifiers):
+        """Both orders should produce the same flags."""
+        genset = parser.parse(self.GENSET.format(modifiers=modifiers))["content"][-1]
+        assert (genset["disjoint"], genset["complete"]) == (True, True)
+        assert parser.errors == []
+
+    def test_duplicate_modifier_is_reported(self, parser):
+        """A repeated modifier should be recorded as a syntax error at its position."""
+        parser.parse(self.GENSET.format(modifiers="disjoint complete disjoint"))
+        assert len(parser.errors) == 1
+        assert parser.errors[0]["message"] == "Duplicate genset modifier 'disjoint'"
+        assert (parser.errors[0]["line"], parser.errors[0]["column"]) == (4, 19)
+
+    def test_duplicate_modifiers_respect_max_errors(self, lexer):
+        """Duplicate-modifier errors should count towards max_errors like any other syntax error."""
+        parser = MyParser(lexer, max_errors=1)
+        parser.build(debug=False, write_tables=False)
+        parser.parse(self.GENSET.format(modifiers="disjoint disjoint complete complete"))
+
+        assert [e["message"] for e in parser.errors] == [
+            "Duplicate genset modifier 'disjoint'",
+            "Too many syntax errors (max_errors=1); parsing stopped",
+        ]
+
+
+class TestNodeShapes:
+    """Tests for the layout of AST node dicts."""
+
+    SOURCE = """package Shapes
+
+kind Person {
+  name : string
+  tags : string [0..*]
+  code : string {const}
+  nicks : string [1..*] {ordered, const}
+  @mediation -- [1] Person
+  @material [1] -- knows -- [0..*] Person
+}
+datatype Address { street : string }
+datatype Phone specializes Address
+enum Color { Red, Green }
+disjoint complete genset G where Person specializes Person
+@material relation Person [1] -- likes -- [1] Person
+relation Person -- hates -- [1] Person
+"""
+
+    def test_nodes_of_same_type_share_key_order(self, lexer):
+        """Every branch that builds a node type should produce the same keys in the same order."""
+        parser = MyParser(lexer)
+        parser.build(debug=False, write_tables=False)
+        ast = parser.parse(self.SOURCE)
+        assert parser.errors == []
+
+        shapes = {}
+        pending = [ast]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, dict):
+                if "node_type" in node:
+                    shapes.setdefault(node["node_type"], set()).add(tuple(node))
+                pending.extend(node.values())
+            elif isinstance(node, (list, tuple)):
+                pending.extend(node)
+
+        assert len(shapes) >= 10
+        assert {node_type: len(keys) for node_type, keys in shapes.items()} == dict.fromkeys(shapes, 1)
+
+    def test_repeated_names_share_one_string(self, lexer):
+        """Names and stereotypes repeated across nodes should be the same interned object."""
+        parser = MyParser(lexer)
+        parser.build(debug=False, write_tables=False)
+        ast = parser.parse(self.SOURCE)
+
+        person = ast["content"][0]
+        inner, outer = person["body"][5], ast["content"][-2]
+        assert inner["second_end"] is person["class_name"]
+        assert inner["relation_stereotype"] is outer["relation_stereotype"]
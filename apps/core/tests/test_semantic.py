@@ -123,6 +123,22 @@ class TestSymbolTable:
         # Only roles
         roles = st.get_children_of("Parent", stereotype="role")
         assert len(roles) == 1
+    def test_lookups_see_later_additions(self):
+        """Lookups made before an add_* call should not hide what was added afterwards."""
+        st = SymbolTable()
+        st.add_class({"node_type": "class_definition", "class_name": "Parent", "class_stereotype": "kind", "specialization": None, "body": None})
+        assert st.get_children_of("Parent") == []
+
+        child = {
+            "node_type": "class_definition",
+            "class_name": "Child",
+            "class_stereotype": "subkind",
+            "specialization": {"node_type": "specialization", "parents": ["Parent"]},
+            "body": None,
+        }
+        st.add_class(child)
+        assert st.get_children_of("Parent") == [child]
+        assert st.get_classes_by_stereotype("subkind") == [child]
     def test_get_parents_of(self, parse_code):
         """Should find parents of a class."""
         code = """
@@ -14,7 +14,7 @@ class ParserAPI:
     def __init__(self):
         self.lexer = MyLexer()
         self.lexer.build()
-        self.parser = MyParser(self.lexer)
+        self.parser = MyParser(self.lexer, error_details=False)  # A interface só exibe mensagem, linha e coluna
         self.parser.build(debug=False, write_tables=False)
         self.semantic = ParserSemantic()
 
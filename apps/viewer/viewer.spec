@@ -1,22 +1,37 @@
 # -*- mode: python ; coding: utf-8 -*-
 
 import os
+import sys
 
 block_cipher = None
 
 # Get the directory where this spec file is located
 spec_dir = os.path.dirname(os.path.abspath(SPEC))
+core_dir = os.path.join(spec_dir, '..', 'core')
+
+# Pre-build the LR table cache so the executable ships with it and never runs yacc at startup
+# (the extracted bundle is temporary, so a cache written at runtime would be lost on exit)
+sys.path.insert(0, core_dir)
+from lexer.MyLexer import MyLexer
+from parser.MyParser import MyParser
+
+_lexer = MyLexer()
+_lexer.build()
+MyParser(_lexer).build()
+parser_cache_file = MyParser.cache_file()
 
 a = Analysis(
     [os.path.join(spec_dir, 'app.py')],
     pathex=[
         spec_dir,
-        os.path.join(spec_dir, '..', 'core'),  # Include core for lexer/parser
+        core_dir,  # Include core for lexer/parser
     ],
     binaries=[],
     datas=[
         # Include the frontend dist folder
         (os.path.join(spec_dir, 'frontend', 'dist'), os.path.join('frontend', 'dist')),
+        # Prebuilt LR tables, next to parser/MyParser where build() looks for them
+        (parser_cache_file, 'parser'),
     ],
     hiddenimports=[
         # pywebview backends